@@ -4,15 +4,20 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import logging
 import sys
 
 from src.database.models import Database
 
 
+@functools.lru_cache(maxsize=1)
 def _pipeline() -> "Pipeline":  # noqa: F821
     """Lazy-import Pipeline so lightweight commands (init, status) work
-    even when heavy dependencies like pyyaml are not yet installed."""
+    even when heavy dependencies like pyyaml are not yet installed.
+
+    The instance is memoized so repeated subcommands in one process share
+    the parsed config and DB handle."""
     from src.pipeline import Pipeline
     return Pipeline()
 
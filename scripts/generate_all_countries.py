@@ -5,19 +5,23 @@ Google News RSS → GPT-5.2 リライト（プレーンテキスト）→ DB保
 UAE or サウジの記事を追加で生成して補填する。
 """
 
+import argparse
+import asyncio
 import logging
-import ssl
+import os
 import sys
-import time
-import urllib.request
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 from dotenv import load_dotenv
 load_dotenv(ROOT / ".env")
 
-from src.images.thumbnail_generator import classify_genre, generate_thumbnail
+from src.images.genre import default_classifier
+from src.images.thumbnail_generator import generate_thumbnail
+from src.ingest import news_feed
 
 logging.basicConfig(
     level=logging.INFO,
@@ -88,195 +92,159 @@ COUNTRY_CONFIG = {
     },
 }
 
-
-# ---------------------------------------------------------------------------
-# ニュース取得
-# ---------------------------------------------------------------------------
-
-def fetch_news(country_key: str, count: int = 10) -> list[dict]:
-    """Google News RSS から指定国のニュースを取得。"""
-    import certifi
-    import feedparser
-
-    ssl_ctx = ssl.create_default_context(cafile=certifi.where())
-    handler = urllib.request.HTTPSHandler(context=ssl_ctx)
-
-    config = COUNTRY_CONFIG[country_key]
-    feeds = config["feeds"]
-
-    articles: list[dict] = []
-    seen: set[str] = set()
-    for url in feeds:
-        try:
-            feed = feedparser.parse(url, handlers=[handler])
-            for entry in feed.entries:
-                title = entry.get("title", "").strip()
-                if not title or title in seen:
-                    continue
-                seen.add(title)
-                articles.append({
-                    "title": title,
-                    "description": entry.get("summary", "")[:800],
-                    "link": entry.get("link", ""),
-                })
-                if len(articles) >= count:
-                    return articles
-        except Exception as e:
-            logger.warning("RSS取得エラー (%s): %s", url[:60], e)
-    return articles
-
-
 # ---------------------------------------------------------------------------
-# GPTリライト
+# DB保存
 # ---------------------------------------------------------------------------
 
-def rewrite_article(client, country_key: str, title: str, description: str) -> dict:
-    """GPT-5.2 にニュースを渡して2000字の日本語記事にリライトさせる。"""
-    config = COUNTRY_CONFIG[country_key]
-    prompt = (
-        f"{config['tone']}\n\n"
-        f"以下のニュースを元に、日本語で約2000文字の記事を書いてください。\n\n"
-        f"【元ニュース】\n"
-        f"タイトル: {title}\n"
-        f"概要: {description}\n\n"
-        f"【ルール】\n"
-        f"- 1行目に記事タイトル（日本語）を書き、2行目は空行、3行目から本文\n"
-        f"- 約2000文字\n"
-        f"- JSONやマークダウンは不要。プレーンテキストのみ\n"
-    )
-
-    response = client.chat.completions.create(
-        model="gpt-5.2",
-        messages=[{"role": "user", "content": prompt}],
-        max_completion_tokens=4000,
-        temperature=0.7,
-    )
-    text = response.choices[0].message.content or ""
-    text = text.strip()
-
-    # 1行目をタイトル、残りを本文として分離
-    lines = text.split("\n", 1)
-    article_title = lines[0].strip().lstrip("#").strip()
-    body = lines[1].strip() if len(lines) > 1 else text
-
+def _db_row(country_key: str, news: dict, article: dict) -> dict:
+    """Database.bulk_insert_articles に渡す1記事分の行を作る。"""
     return {
-        "title": article_title,
-        "body": body,
-        "hashtags": config["hashtags"],
+        "news": {
+            "country": country_key,
+            "title": news["title"],
+            "url": news.get("link", ""),
+            "source": "Google News RSS",
+            "summary": news.get("description", "")[:200],
+            "relevance_score": 80.0,
+            "status": "processed",
+        },
+        "article": {
+            "country": country_key,
+            "language": "ja",
+            "platform": "web",
+            "title": article["title"],
+            "body": article["body"],
+            "caption": article["title"][:150],
+            "hashtags": article["hashtags"],
+            "status": "published",
+        },
+        "asset": {
+            "image_path": "[placeholder]",
+            "prompt_used": f"auto-thumbnail: {country_key}/{article['title'][:80]}",
+            "aspect_ratio": "1200:630",
+        },
     }
 
 
-# ---------------------------------------------------------------------------
-# DB保存
-# ---------------------------------------------------------------------------
-
-def _load_genres_config() -> dict:
-    """Load genre configuration from countries.yaml."""
-    import yaml
-
-    config_path = ROOT / "config" / "countries.yaml"
-    with open(config_path, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)
-    return config.get("genres", {})
+def save_to_db(
+    db, country_key: str, pairs: list[tuple[dict, dict]], executor: ProcessPoolExecutor,
+) -> list[tuple[int, int, Future]]:
+    """1カ国分の (元ニュース, 生成記事) のペアをまとめてDBに保存し、サムネイル生成をワーカープロセスに投入する。
 
+    ニュース・記事・画像（プレースホルダー）は1トランザクションの executemany で
+    一括登録する。サムネイルは次の国の GPT 呼び出しと並行して生成され、
+    完了後に finish_thumbnails() で画像パスを反映する。
 
-# Cache genres config at module level (loaded lazily on first use)
-_genres_config: dict | None = None
-
-
-def _get_genres_config() -> dict:
-    global _genres_config
-    if _genres_config is None:
-        _genres_config = _load_genres_config()
-    return _genres_config
-
-
-def save_to_db(db, country_key: str, news: dict, article: dict) -> None:
-    """ニュースと記事をDBに保存し、サムネイル画像を自動生成する。"""
-    news_id = db.insert_news_item(
-        country=country_key,
-        title=news["title"],
-        url=news.get("link", ""),
-        source="Google News RSS",
-        summary=news.get("description", "")[:200],
-        relevance_score=80.0,
+    Returns:
+        (article_id, visual_asset_id, サムネイル生成の Future) のリスト
+    """
+    ids = db.bulk_insert_articles(
+        [_db_row(country_key, news, article) for news, article in pairs]
     )
-    db.update_news_status(news_id, "processed")
-
-    article_id = db.insert_article(
-        news_item_id=news_id,
-        country=country_key,
-        language="ja",
-        platform="web",
-        title=article["title"],
-        body=article["body"],
-        caption=article["title"][:150],
-        hashtags=article["hashtags"],
-    )
-    db.update_article_status(article_id, "published")
 
-    # Generate thumbnail image automatically
-    try:
-        genres_config = _get_genres_config()
-        genre = classify_genre(article["title"], article["body"], genres_config)
-        thumbnail_path = generate_thumbnail(
+    pending = []
+    for (_, article), (article_id, asset_id) in zip(pairs, ids):
+        # Generate thumbnail image automatically (genre is classified in-process)
+        genre = default_classifier().classify(article["title"], article["body"])
+        future = executor.submit(
+            generate_thumbnail,
             title=article["title"],
             country=country_key,
             genre=genre,
             article_id=article_id,
         )
-        image_path = str(thumbnail_path)
+        pending.append((article_id, asset_id, future))
+    return pending
+
+
+def finish_thumbnails(db, pending: list[tuple[int, int, Future]]) -> None:
+    """投入済みのサムネイル生成を待ち、成功したものの画像パスをDBに反映する。"""
+    for _, asset_id, future in pending:
+        try:
+            thumbnail_path = future.result()
+        except Exception as e:
+            logger.warning("    Thumbnail generation failed: %s (using placeholder)", e)
+            continue
+        db.update_visual_asset_image(asset_id, str(thumbnail_path))
         logger.info("    Thumbnail generated: %s", thumbnail_path.name)
-    except Exception as e:
-        logger.warning("    Thumbnail generation failed: %s (using placeholder)", e)
-        image_path = "[placeholder]"
-
-    db.insert_visual_asset(
-        article_id=article_id,
-        image_path=image_path,
-        prompt_used=f"auto-thumbnail: {country_key}/{article['title'][:80]}",
-        aspect_ratio="1200:630",
-    )
 
 
 # ---------------------------------------------------------------------------
 # 1カ国分の記事生成
 # ---------------------------------------------------------------------------
 
-def generate_for_country(client, db, country_key: str, target: int = 5) -> int:
-    """指定国のニュースを取得 → GPTリライト → DB保存。生成成功数を返す。"""
+async def fetch_country_news(db, country_key: str, target: int) -> list[dict]:
+    """指定国のニュースを RSS から取得する（DB登録済みのものは除外）。"""
     config = COUNTRY_CONFIG[country_key]
     logger.info("=== %s: ニュース取得中... ===", config["name"])
+    return await news_feed.fetch_news(
+        config["feeds"],
+        count=target * 2,
+        is_known=lambda title, url: db.news_exists(country_key, title, url),
+    )
+
+
+async def generate_for_country(
+    db,
+    cache,
+    executor: ProcessPoolExecutor,
+    pending_thumbnails: list[tuple[int, int, Future]],
+    country_key: str,
+    target: int = 5,
+    news_list: Optional[list[dict]] = None,
+) -> int:
+    """指定国のニュースを取得 → GPTリライト → DB保存。生成成功数を返す。
 
-    news_list = fetch_news(country_key, count=target * 2)
+    サムネイル生成の Future は pending_thumbnails に追加される。
+    news_list を渡した場合（先読み済み）は RSS 取得を省略する。
+
+    GPTリライトは不足分ずつ1回のリクエストにまとめ（トーンとルールを1回だけ送る）、
+    DB保存は国ごとに1回まとめて行う。
+    """
+    config = COUNTRY_CONFIG[country_key]
+    if news_list is None:
+        news_list = await fetch_country_news(db, country_key, target)
     logger.info("%s: %d 件のニュースを取得", config["name"], len(news_list))
 
     if not news_list:
         logger.warning("%s: ニュースが取得できませんでした", config["name"])
         return 0
 
-    success = 0
-    for i, news in enumerate(news_list):
-        if success >= target:
-            break
-        logger.info("  [%d/%d] %s", i + 1, len(news_list), news["title"][:60])
-
-        try:
-            article = rewrite_article(client, country_key, news["title"], news["description"])
-            logger.info("    → 生成OK: %s (%d文字)", article["title"][:40], len(article["body"]))
-        except Exception as e:
-            logger.error("    → GPTリライト失敗: %s", e)
-            continue
-
+    generated: list[tuple[dict, dict]] = []
+    offset = 0
+    while len(generated) < target and offset < len(news_list):
+        batch = news_list[offset:offset + target - len(generated)]
         try:
-            save_to_db(db, country_key, news, article)
-            success += 1
+            results = await news_feed.rewrite_cached_batch(
+                cache, country_key, batch, tone=config["tone"], hashtags=config["hashtags"],
+            )
         except Exception as e:
-            logger.error("    → DB保存失敗: %s", e)
-            continue
+            results = [e] * len(batch)
+
+        wave_ok = 0
+        for news, article in zip(batch, results):
+            if isinstance(article, BaseException):
+                logger.error("  → GPTリライト失敗: %s (%s)", news["title"][:60], article)
+                continue
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "    → 生成OK: %s (%d文字)", article["title"][:40], len(article["body"]),
+                )
+            generated.append((news, article))
+            wave_ok += 1
+
+        offset += len(batch)
+        logger.info(
+            "  [%d/%d] %d/%d 本のリライトに成功",
+            offset, len(news_list), wave_ok, len(batch),
+        )
 
-        # APIレートリミット対策
-        time.sleep(1)
+    try:
+        pending_thumbnails.extend(save_to_db(db, country_key, generated, executor))
+        success = len(generated)
+    except Exception as e:
+        logger.error("    → DB保存失敗: %s", e)
+        success = 0
 
     logger.info("=== %s: %d/%d 本の記事を生成完了 ===", config["name"], success, target)
     return success
@@ -286,21 +254,37 @@ def generate_for_country(client, db, country_key: str, target: int = 5) -> int:
 # メイン
 # ---------------------------------------------------------------------------
 
-def main():
-    from openai import OpenAI
+async def main_async(use_cache: bool = True):
+    from src.database.llm_cache import RewriteCache
     from src.database.models import Database
     from src.site_generator import SiteGenerator
 
-    openai_client = OpenAI()
     db = Database()
     db.init_db()
+    cache = RewriteCache(db, enabled=use_cache)
+    executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+    pending_thumbnails: list[tuple[int, int, Future]] = []
 
     results: dict[str, int] = {}
 
     # --- 全4カ国の記事生成 ---
-    for country_key in ["uae", "saudi", "brunei", "japan"]:
+    # 次の国の RSS 取得は、現在の国の GPT リライトと並行して先読みする
+    countries = ["uae", "saudi", "brunei", "japan"]
+
+    def _prefetch(country_key: str) -> asyncio.Task:
         target = COUNTRY_CONFIG[country_key]["target_count"]
-        count = generate_for_country(openai_client, db, country_key, target)
+        return asyncio.create_task(fetch_country_news(db, country_key, target))
+
+    next_fetch = _prefetch(countries[0])
+    for i, country_key in enumerate(countries):
+        news_list = await next_fetch
+        if i + 1 < len(countries):
+            next_fetch = _prefetch(countries[i + 1])
+        target = COUNTRY_CONFIG[country_key]["target_count"]
+        count = await generate_for_country(
+            db, cache, executor, pending_thumbnails, country_key, target,
+            news_list=news_list,
+        )
         results[country_key] = count
 
     # --- ブルネイ補填ロジック ---
@@ -315,11 +299,16 @@ def main():
         supplement_countries = ["uae", "saudi"]
         for i in range(shortfall):
             supplement_country = supplement_countries[i % len(supplement_countries)]
-            extra = generate_for_country(
-                openai_client, db, supplement_country, target=1,
+            extra = await generate_for_country(
+                db, cache, executor, pending_thumbnails, supplement_country, target=1,
             )
             results[supplement_country] = results.get(supplement_country, 0) + extra
 
+    # --- サムネイル生成の完了待ち ---
+    finish_thumbnails(db, pending_thumbnails)
+    executor.shutdown()
+    await news_feed.aclose()
+
     db.close()
 
     # --- サマリー表示 ---
@@ -331,11 +320,22 @@ def main():
     logger.info("  合計: %d 本", total)
     logger.info("========================================")
 
-    # --- サイト生成 ---
+    # --- サイト生成（今回追加した記事のみ差分更新） ---
     logger.info("=== サイト再生成中... ===")
-    SiteGenerator().generate_all()
+    SiteGenerator().regenerate(article_id for article_id, _, _ in pending_thumbnails)
     logger.info("=== 全処理完了! ===")
 
 
+def main():
+    parser = argparse.ArgumentParser(description="全カ国のニュース記事を自動生成する")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="GPTリライトのキャッシュを使わずに必ず再生成する",
+    )
+    args = parser.parse_args()
+    asyncio.run(main_async(use_cache=not args.no_cache))
+
+
 if __name__ == "__main__":
     main()
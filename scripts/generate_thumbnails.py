@@ -16,14 +16,24 @@ from __future__ import annotations
 
 import argparse
 import logging
+import os
 import sys
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
 from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
 
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
 from src.database.models import Database
-from src.images.thumbnail_generator import classify_genre, generate_thumbnail
+from src.images.genre import default_classifier
+from src.images.thumbnail_generator import generate_thumbnail
 
 logging.basicConfig(
     level=logging.INFO,
@@ -32,14 +42,82 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def _load_genres_config() -> dict:
-    """Load genre configuration from countries.yaml."""
-    import yaml
+def _render_one(
+    task: tuple[int, str, str, str, int | None],
+) -> tuple[int, int | None, str, str, str, str | None]:
+    """Classify and render one thumbnail in a worker process.
+
+    Does not touch SQLite; the parent process applies the result. Each
+    worker loads the genre keywords from countries.yaml once.
+
+    Args:
+        task: ``(article_id, title, body, country, asset_id)``.
 
-    config_path = ROOT / "config" / "countries.yaml"
-    with open(config_path, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)
-    return config.get("genres", {})
+    Returns:
+        ``(article_id, asset_id, image_path, country, genre, error)`` where
+        *error* is None on success.
+    """
+    article_id, title, body, country, asset_id = task
+    genre = default_classifier().classify(title, body)
+    try:
+        output_path = generate_thumbnail(
+            title=title,
+            country=country,
+            genre=genre,
+            article_id=article_id,
+        )
+    except Exception as e:
+        return article_id, asset_id, "", country, genre, str(e)
+    return article_id, asset_id, str(output_path), country, genre, None
+
+
+def _bounded_map(
+    executor: Executor,
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_in_flight: int,
+) -> Iterator[Any]:
+    """Yield ``fn(item)`` results in completion order.
+
+    Items are pulled from *items* lazily and at most *max_in_flight* are
+    pending at once, so a streaming source is never fully materialized.
+    """
+    pending: set = set()
+    for item in items:
+        pending.add(executor.submit(fn, item))
+        if len(pending) >= max_in_flight:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    for future in as_completed(pending):
+        yield future.result()
+
+
+# Pending visual_assets writes are flushed in one transaction every N rows
+_FLUSH_EVERY = 50
+
+
+def _flush_assets(
+    db: Database,
+    updates: list[tuple[str, int]],
+    inserts: list[tuple[int, str, str, str]],
+) -> None:
+    """Apply pending visual_assets writes in one transaction and clear the lists."""
+    if not updates and not inserts:
+        return
+    with db.transaction() as conn:
+        conn.executemany(
+            "UPDATE visual_assets SET image_path = ? WHERE id = ?",
+            updates,
+        )
+        conn.executemany(
+            """INSERT INTO visual_assets
+               (article_id, image_path, prompt_used, aspect_ratio, created_at)
+               VALUES (?, ?, ?, ?, datetime('now'))""",
+            inserts,
+        )
+    updates.clear()
+    inserts.clear()
 
 
 def generate_all_thumbnails(
@@ -59,7 +137,9 @@ def generate_all_thumbnails(
     """
     db = Database()
     db.init_db()
-    genres_config = _load_genres_config()
+    # Parse countries.yaml up front so config errors surface here and
+    # forked workers inherit the classifier.
+    default_classifier()
 
     # Query articles
     conn = db.conn
@@ -94,78 +174,77 @@ def generate_all_thumbnails(
     if limit:
         query += f" LIMIT {limit}"
 
-    rows = conn.execute(query, params).fetchall()
+    total = conn.execute(f"SELECT COUNT(*) FROM ({query})", params).fetchone()[0]
 
-    if not rows:
+    if not total:
         logger.info("No articles need thumbnail generation.")
         db.close()
         return 0
 
-    logger.info("Found %d articles for thumbnail generation.%s", len(rows),
+    logger.info("Found %d articles for thumbnail generation.%s", total,
                 " (--force: regenerating all)" if force else "")
 
-    success = 0
-    for row in rows:
-        article_id = row["article_id"]
-        article_country = row["country"]
-        title = row["title"] or ""
-        body = row["body"] or ""
-        asset_id = row["asset_id"]
-
-        # Classify genre
-        genre = classify_genre(title, body, genres_config)
+    # Stream rows one at a time from a separate connection: in WAL mode its
+    # SELECT keeps a stable snapshot while the flushes below write via ``db``.
+    reader = Database(db.db_path)
+    tasks = (
+        (
+            row["article_id"],
+            row["title"] or "",
+            row["body"] or "",
+            row["country"],
+            row["asset_id"],
+        )
+        for row in reader.conn.execute(query, params)
+    )
 
-        try:
-            # Generate thumbnail
-            output_path = generate_thumbnail(
-                title=title,
-                country=article_country,
-                genre=genre,
-                article_id=article_id,
-            )
-
-            # Update visual_assets with real path
-            image_path_str = str(output_path)
-
-            if asset_id:
-                # Update existing visual_asset record
-                conn.execute(
-                    "UPDATE visual_assets SET image_path = ? WHERE id = ?",
-                    (image_path_str, asset_id),
-                )
-            else:
-                # No visual_asset record exists; create one
-                conn.execute(
-                    """INSERT INTO visual_assets
-                       (article_id, image_path, prompt_used, aspect_ratio, created_at)
-                       VALUES (?, ?, ?, ?, datetime('now'))""",
-                    (
+    updates: list[tuple[str, int]] = []
+    inserts: list[tuple[int, str, str, str]] = []
+    success = 0
+    max_workers = os.cpu_count() or 1
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = _bounded_map(executor, _render_one, tasks, max_workers * 4)
+            for article_id, asset_id, image_path_str, article_country, genre, error in results:
+                if error is not None:
+                    logger.error(
+                        "  Failed article_id=%d: %s", article_id, error,
+                    )
+                    continue
+
+                if asset_id:
+                    # Update existing visual_asset record
+                    updates.append((image_path_str, asset_id))
+                else:
+                    # No visual_asset record exists; create one
+                    inserts.append((
                         article_id,
                         image_path_str,
                         f"auto-thumbnail: {article_country}/{genre}",
                         "1200:630",
-                    ),
+                    ))
+                if len(updates) + len(inserts) >= _FLUSH_EVERY:
+                    _flush_assets(db, updates, inserts)
+                success += 1
+
+                logger.info(
+                    "  [%d/%d] article_id=%d (%s) -> %s",
+                    success,
+                    total,
+                    article_id,
+                    article_country,
+                    Path(image_path_str).name,
                 )
-            conn.commit()
-            success += 1
-
-            logger.info(
-                "  [%d/%d] article_id=%d (%s) -> %s",
-                success,
-                len(rows),
-                article_id,
-                article_country,
-                output_path.name,
-            )
-
-        except Exception as e:
-            logger.error(
-                "  Failed article_id=%d: %s", article_id, e,
-            )
-            continue
-
-    db.close()
-    logger.info("Generated %d/%d thumbnails successfully.", success, len(rows))
+    finally:
+        # Keep what was rendered and release both connections even when a
+        # worker error propagates out of the pool.
+        try:
+            _flush_assets(db, updates, inserts)
+        finally:
+            reader.close()
+            db.close()
+
+    logger.info("Generated %d/%d thumbnails successfully.", success, total)
     return success
 
 
@@ -8,6 +8,8 @@ DB から本日公開された記事を取得し、GPT で要点を抽出して
   python scripts/generate_tiktok_videos.py --country uae      # UAE のみ
   python scripts/generate_tiktok_videos.py --limit 3          # 最大3本
   python scripts/generate_tiktok_videos.py --date 2026-02-20  # 日付指定
+  python scripts/generate_tiktok_videos.py --no-cache         # 要点を必ず再抽出
+  python scripts/generate_tiktok_videos.py --local-only       # 要点抽出に GPT を使わない
 
 依存:
   - moviepy (ffmpeg が必要)
@@ -16,11 +18,13 @@ DB から本日公開された記事を取得し、GPT で要点を抽出して
 """
 
 import argparse
+import asyncio
+import hashlib
 import logging
 import re
+import sqlite3
 import sys
-import time
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent.parent
@@ -28,79 +32,99 @@ sys.path.insert(0, str(ROOT))
 from dotenv import load_dotenv
 load_dotenv(ROOT / ".env")
 
+from src.images.genre import default_classifier, load_genres_config
+from src import gpt
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(message)s",
 )
+# フォーマットで使わないスレッド・プロセス情報はログレコードに集めない
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
-# ジャンル分類 (countries.yaml のキーワードを簡易利用)
+# ジャンル分類 (countries.yaml のキーワードを共有)
 # ---------------------------------------------------------------------------
 
-GENRE_KEYWORDS: dict[str, list[str]] = {
-    "ビジネス": ["investment", "投資", "business", "ビジネス", "fund", "capital", "IPO", "M&A", "startup", "法人", "company"],
-    "不動産": ["real estate", "不動産", "property", "物件", "housing", "development", "construction"],
-    "ライフスタイル": ["lifestyle", "移住", "education", "教育", "visa", "ビザ", "living", "school", "health", "生活"],
-    "文化": ["culture", "文化", "craft", "工芸", "halal", "ハラール", "tradition", "伝統", "art", "museum", "heritage"],
-    "テクノロジー": ["technology", "テクノロジー", "AI", "tech", "digital", "blockchain", "innovation"],
-    "エンターテイメント": ["entertainment", "エンタメ", "sport", "スポーツ", "tourism", "観光", "hotel", "event", "festival"],
-}
-
-
 def classify_genre(title: str, body: str) -> str:
-    """タイトルと本文からジャンルを推定する。"""
-    text = (title + " " + body).lower()
-    best_genre = "ビジネス"
-    best_count = 0
-    for genre, keywords in GENRE_KEYWORDS.items():
-        count = sum(1 for kw in keywords if kw.lower() in text)
-        if count > best_count:
-            best_count = count
-            best_genre = genre
-    return best_genre
+    """タイトルと本文からジャンルを推定し、表示用の日本語名を返す。"""
+    genre_key = default_classifier().classify(title, body)
+    return load_genres_config().get(genre_key, {}).get("name_ja", "ビジネス")
 
 
 # ---------------------------------------------------------------------------
 # GPT で要点抽出
 # ---------------------------------------------------------------------------
 
-def extract_key_points(client, title: str, body: str) -> list[str]:
+KEY_POINTS_MODEL = "gpt-4o-mini"
+
+# 要点抽出結果の llm_cache 名前空間（本文の要点を改行区切りで body に保存）
+_KEY_POINTS_NAMESPACE = "tiktok:key_points"
+
+# 要点抽出に渡す本文の最大文字数
+_KEY_POINTS_BODY_CHARS = 2000
+
+_KEY_POINTS_PROMPT = (
+    "以下のビジネス記事から、TikTok動画用に3つの要点を抽出してください。\n\n"
+    "【ルール】\n"
+    "- 各要点は日本語で1-2文（40文字以内を目安）\n"
+    "- 数字やデータがあれば優先的に含める\n"
+    "- 読者が「知りたい」と思うインパクトのある内容を選ぶ\n"
+    "- 絵文字は使わない\n"
+    "- 各要点は改行で区切る。番号は付けない\n"
+    "- 3つだけ出力する。他の説明は不要\n\n"
+    "【タイトル】\n{title}\n\n"
+    "【本文】\n{body}\n"
+)
+
+
+def _key_points_cache_key(title: str, body_trimmed: str) -> str:
+    raw = f"{KEY_POINTS_MODEL}|{title}|{body_trimmed}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+async def extract_key_points(title: str, body: str, db=None) -> list[str]:
     """GPT を使って記事から 3 つの要点を抽出する。
 
+    db を渡した場合は (モデル, タイトル, 本文) のハッシュで llm_cache を引き、
+    再実行時に同じ記事で API を呼ばない。
+
     Args:
-        client: OpenAI クライアント。
         title: 記事タイトル。
         body: 記事本文。
+        db: キャッシュに使う Database インスタンス (None でキャッシュなし)。
 
     Returns:
         3 つの要点テキストのリスト。
     """
     # 本文が長すぎる場合は先頭 2000 文字に切り詰め
-    body_trimmed = body[:2000] if len(body) > 2000 else body
-
-    prompt = (
-        "以下のビジネス記事から、TikTok動画用に3つの要点を抽出してください。\n\n"
-        "【ルール】\n"
-        "- 各要点は日本語で1-2文（40文字以内を目安）\n"
-        "- 数字やデータがあれば優先的に含める\n"
-        "- 読者が「知りたい」と思うインパクトのある内容を選ぶ\n"
-        "- 絵文字は使わない\n"
-        "- 各要点は改行で区切る。番号は付けない\n"
-        "- 3つだけ出力する。他の説明は不要\n\n"
-        f"【タイトル】\n{title}\n\n"
-        f"【本文】\n{body_trimmed}\n"
-    )
+    body_trimmed = body[:_KEY_POINTS_BODY_CHARS]
+
+    cache_key = None
+    if db is not None:
+        cache_key = _key_points_cache_key(title, body_trimmed)
+        # キャッシュの読み書きに失敗しても、その記事は GPT 呼び出しで続行する
+        try:
+            hit = db.get_llm_cache(cache_key)
+        except sqlite3.Error as e:
+            logger.warning("要点キャッシュ読み込み失敗: %s - %s", title[:40], e)
+            hit = None
+        if hit is not None:
+            logger.info("  → 要点キャッシュヒット: %s", title[:40])
+            return hit["body"].split("\n")
+
+    prompt = _KEY_POINTS_PROMPT.format(title=title, body=body_trimmed)
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
+        text = await gpt.complete(
+            prompt,
+            model=KEY_POINTS_MODEL,
             max_completion_tokens=300,
             temperature=0.5,
         )
-        text = response.choices[0].message.content or ""
-        text = text.strip()
 
         # 行ごとに分割して空行を除去
         lines = [
@@ -116,6 +140,16 @@ def extract_key_points(client, title: str, body: str) -> list[str]:
                 "要点抽出が %d 件のみ (期待: 3 件): %s",
                 len(key_points), title[:40],
             )
+        if cache_key is not None and key_points:
+            try:
+                db.insert_llm_cache(
+                    key=cache_key,
+                    namespace=_KEY_POINTS_NAMESPACE,
+                    title=title,
+                    body="\n".join(key_points),
+                )
+            except sqlite3.Error as e:
+                logger.warning("要点キャッシュ保存失敗: %s - %s", title[:40], e)
 
         return key_points
 
@@ -125,6 +159,54 @@ def extract_key_points(client, title: str, body: str) -> list[str]:
         return [title[:40], "", ""]
 
 
+async def extract_all_key_points(articles: list[dict], db=None) -> list[list[str]]:
+    """全記事の要点抽出を並列に実行する（同時実行数とレートは src.gpt で制限）。"""
+    sem = asyncio.Semaphore(gpt.GPT_CONCURRENCY)
+
+    async def _one(article: dict) -> list[str]:
+        async with sem:
+            return await extract_key_points(article["title"], article.get("body", "") or "", db)
+
+    return await asyncio.gather(*[_one(article) for article in articles])
+
+
+# ---------------------------------------------------------------------------
+# ローカル要点抽出 (GPT を使わない)
+# ---------------------------------------------------------------------------
+
+# 文末記号の直後、または改行で文を区切る
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[。！？!?])|\n")
+# 箇条書き・引用の記号
+_MARKDOWN_PREFIX_RE = re.compile(r"^[>*\-・\s]+")
+
+# 要点として採用する文の長さ (文字数)
+_LOCAL_POINT_MIN_LEN = 10
+_LOCAL_POINT_MAX_LEN = 60
+
+
+def extract_key_points_local(title: str, body: str) -> list[str]:
+    """本文から要点 3 つを GPT なしで選ぶ。
+
+    短い文 (10-60 文字) のうち数字を含むものを優先し、足りない分は
+    残りの短い文で補う。順序は本文中の出現順を保つ。
+    候補が 1 つもなければタイトルを要点として使う。
+    """
+    sentences = []
+    for raw in _SENTENCE_SPLIT_RE.split(body):
+        if raw.lstrip().startswith("#"):
+            continue  # 見出しは要点にしない
+        sentence = _MARKDOWN_PREFIX_RE.sub("", raw).strip()
+        if _LOCAL_POINT_MIN_LEN <= len(sentence) <= _LOCAL_POINT_MAX_LEN:
+            sentences.append(sentence)
+
+    with_digits = [i for i, sentence in enumerate(sentences) if any(c.isdigit() for c in sentence)]
+    others = [i for i, sentence in enumerate(sentences) if not any(c.isdigit() for c in sentence)]
+    chosen = sorted((with_digits + others)[:3])
+
+    if not chosen:
+        return [title[:40], "", ""]
+    return [sentences[i] for i in chosen]
+
 # ---------------------------------------------------------------------------
 # DB からの記事取得
 # ---------------------------------------------------------------------------
@@ -146,12 +228,15 @@ def get_todays_articles(
     Returns:
         記事辞書のリスト。
     """
+    # created_at は ISO 8601 文字列なので、日付の前方一致は [当日, 翌日) の範囲比較で引ける
+    next_date = (date.fromisoformat(target_date) + timedelta(days=1)).isoformat()
     clauses = [
         "status IN ('approved', 'scheduled', 'published')",
         "platform = 'web'",
-        f"created_at LIKE '{target_date}%'",
+        "created_at >= ?",
+        "created_at < ?",
     ]
-    params: list = []
+    params: list = [target_date, next_date]
 
     if country:
         clauses.append("country = ?")
@@ -172,10 +257,14 @@ def get_todays_articles(
 # スラッグ生成
 # ---------------------------------------------------------------------------
 
+_SLUG_NON_WORD_RE = re.compile(r"[^\w\s-]")
+_SLUG_SEPARATOR_RE = re.compile(r"[\s_]+")
+
+
 def make_slug(title: str, max_len: int = 50) -> str:
     """タイトルから URL-safe なスラッグを生成する。"""
-    slug = re.sub(r"[^\w\s-]", "", title.lower())
-    slug = re.sub(r"[\s_]+", "-", slug).strip("-")
+    slug = _SLUG_NON_WORD_RE.sub("", title.lower())
+    slug = _SLUG_SEPARATOR_RE.sub("-", slug).strip("-")
     if not slug:
         slug = "article"
     return slug[:max_len]
@@ -206,6 +295,16 @@ def main() -> None:
         default=None,
         help="対象日 (YYYY-MM-DD, 省略時: 今日)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="要点抽出のキャッシュを使わずに必ず GPT を呼ぶ",
+    )
+    parser.add_argument(
+        "--local-only",
+        action="store_true",
+        help="要点を本文から機械的に選び、GPT を呼ばない",
+    )
     args = parser.parse_args()
 
     # 対象日
@@ -227,11 +326,9 @@ def main() -> None:
         )
         sys.exit(1)
 
-    from openai import OpenAI
     from src.database.models import Database
     from src.video.generator import TikTokVideoGenerator
 
-    openai_client = OpenAI()
     db = Database()
     db.init_db()
     gen = TikTokVideoGenerator()
@@ -245,23 +342,16 @@ def main() -> None:
         db.close()
         return
 
-    # ── 動画生成ループ ──
+    # ── 生成済みチェック ──
     success = 0
     skipped = 0
     failed = 0
 
-    for i, article in enumerate(articles):
-        title = article["title"]
-        body = article.get("body", "") or ""
-        country = article["country"]
-        hashtags = article.get("hashtags", "") or ""
-        article_id = article["id"]
-
-        logger.info("[%d/%d] %s (%s)", i + 1, len(articles), title[:50], country)
-
+    pending: list[tuple[dict, Path]] = []
+    for article in articles:
         # 出力パス
-        slug = make_slug(title)
-        country_dir = gen.output_dir / country
+        slug = make_slug(article["title"])
+        country_dir = gen.output_dir / article["country"]
         country_dir.mkdir(parents=True, exist_ok=True)
         output_path = country_dir / f"{target_date}_{slug}.mp4"
 
@@ -270,18 +360,33 @@ def main() -> None:
             logger.info("  → スキップ (既に生成済み): %s", output_path.name)
             skipped += 1
             continue
+        pending.append((article, output_path))
+
+    # ── 要点抽出（GPT は全記事を並列に） ──
+    if args.local_only:
+        all_key_points = [
+            extract_key_points_local(article["title"], article.get("body", "") or "")
+            for article, _ in pending
+        ]
+    else:
+        all_key_points = asyncio.run(extract_all_key_points(
+            [article for article, _ in pending], db=None if args.no_cache else db,
+        ))
+
+    # ── 動画生成ループ ──
+    for i, ((article, output_path), key_points) in enumerate(zip(pending, all_key_points)):
+        title = article["title"]
+        body = article.get("body", "") or ""
+        country = article["country"]
+        hashtags = article.get("hashtags", "") or ""
+
+        logger.info("[%d/%d] %s (%s)", i + 1, len(pending), title[:50], country)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("  → 要点: %s", " / ".join(kp[:20] for kp in key_points))
 
         # ジャンル分類
         genre = classify_genre(title, body)
 
-        # GPT で要点抽出
-        try:
-            key_points = extract_key_points(openai_client, title, body)
-            logger.info("  → 要点抽出OK: %s", " / ".join(kp[:20] for kp in key_points))
-        except Exception as e:
-            logger.error("  → 要点抽出失敗: %s", e)
-            key_points = [title[:40], "", ""]
-
         # 動画生成
         try:
             result_path = gen.generate(
@@ -300,9 +405,6 @@ def main() -> None:
             failed += 1
             continue
 
-        # API レートリミット対策 (GPT)
-        time.sleep(0.5)
-
     db.close()
 
     # ── サマリー ──
@@ -4,9 +4,9 @@ GPT-5.2でConnect-Sekaiの旅行ガイド記事を生成し、DB保存 → サ
 ニュースベースではなく、固定トピックに基づく実用的な旅行ガイド記事。
 """
 
+import asyncio
 import logging
 import sys
-import time
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent.parent
@@ -14,6 +14,8 @@ sys.path.insert(0, str(ROOT))
 from dotenv import load_dotenv
 load_dotenv(ROOT / ".env")
 
+from src import gpt
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(message)s",
@@ -159,7 +161,7 @@ TRAVEL_TOPICS = {
 # GPT記事生成
 # ---------------------------------------------------------------------------
 
-def generate_travel_article(client, country_key: str, topic_info: dict) -> dict:
+async def generate_travel_article(country_key: str, topic_info: dict) -> dict:
     """GPT-5.2 で旅行ガイド記事を生成する。"""
     country_name = "UAE" if country_key == "uae" else "サウジアラビア"
     prompt = (
@@ -175,19 +177,8 @@ def generate_travel_article(client, country_key: str, topic_info: dict) -> dict:
         f"- JSONやマークダウンは不要。プレーンテキストのみ\n"
     )
 
-    response = client.chat.completions.create(
-        model="gpt-5.2",
-        messages=[{"role": "user", "content": prompt}],
-        max_completion_tokens=4000,
-        temperature=0.7,
-    )
-    text = response.choices[0].message.content or ""
-    text = text.strip()
-
     # 1行目をタイトル、残りを本文として分離
-    lines = text.split("\n", 1)
-    article_title = lines[0].strip().lstrip("#").strip()
-    body = lines[1].strip() if len(lines) > 1 else text
+    article_title, body = await gpt.generate_title_body(prompt)
 
     return {
         "title": article_title,
@@ -196,84 +187,100 @@ def generate_travel_article(client, country_key: str, topic_info: dict) -> dict:
     }
 
 
+async def _bounded_generate(sem: asyncio.Semaphore, country_key: str, topic_info: dict) -> dict:
+    """セマフォで同時実行数を制限しつつ generate_travel_article を呼ぶ。"""
+    async with sem:
+        return await generate_travel_article(country_key, topic_info)
+
+
 # ---------------------------------------------------------------------------
 # DB保存
 # ---------------------------------------------------------------------------
 
-def save_travel_article_to_db(db, country_key: str, topic_info: dict, article: dict) -> None:
-    """旅行記事をDBに保存する。"""
-    news_id = db.insert_news_item(
-        country=country_key,
-        title=topic_info["topic"],
-        url="",
-        source="Connect-Sekai Travel Guide",
-        summary=f"旅行ガイド: {topic_info['topic']}",
-        relevance_score=90.0,
-    )
-    db.update_news_status(news_id, "processed")
-
-    article_id = db.insert_article(
-        news_item_id=news_id,
-        country=country_key,
-        language="ja",
-        platform="web",
-        title=article["title"],
-        body=article["body"],
-        caption=article["title"][:150],
-        hashtags=article["hashtags"],
-    )
-    db.update_article_status(article_id, "published")
-
-    db.insert_visual_asset(
-        article_id=article_id,
-        image_path="[placeholder]",
-        prompt_used=f"Travel: {article['title'][:80]}",
-        aspect_ratio="16:9",
-    )
+def _db_row(country_key: str, topic_info: dict, article: dict) -> dict:
+    """Database.bulk_insert_articles に渡す旅行記事1本分の行を作る。"""
+    return {
+        "news": {
+            "country": country_key,
+            "title": topic_info["topic"],
+            "url": "",
+            "source": "Connect-Sekai Travel Guide",
+            "summary": f"旅行ガイド: {topic_info['topic']}",
+            "relevance_score": 90.0,
+            "status": "processed",
+        },
+        "article": {
+            "country": country_key,
+            "language": "ja",
+            "platform": "web",
+            "title": article["title"],
+            "body": article["body"],
+            "caption": article["title"][:150],
+            "hashtags": article["hashtags"],
+            "status": "published",
+        },
+        "asset": {
+            "image_path": "[placeholder]",
+            "prompt_used": f"Travel: {article['title'][:80]}",
+            "aspect_ratio": "16:9",
+        },
+    }
 
 
 # ---------------------------------------------------------------------------
 # メイン
 # ---------------------------------------------------------------------------
 
-def main():
-    from openai import OpenAI
+async def main_async():
     from src.database.models import Database
     from src.site_generator import SiteGenerator
 
-    openai_client = OpenAI()
     db = Database()
     db.init_db()
 
     results: dict[str, int] = {"uae": 0, "saudi": 0}
 
-    for country_key in ["uae", "saudi"]:
+    # GPT 生成は全トピックを並列に実行し、DB保存は最後に1トランザクションでまとめて行う
+    sem = asyncio.Semaphore(gpt.GPT_CONCURRENCY)
+    countries = ["uae", "saudi"]
+    generated = await asyncio.gather(
+        *[
+            _bounded_generate(sem, country_key, topic_info)
+            for country_key in countries
+            for topic_info in TRAVEL_TOPICS[country_key]
+        ],
+        return_exceptions=True,
+    )
+
+    rows: list[dict] = []
+    offset = 0
+    for country_key in countries:
         topics = TRAVEL_TOPICS[country_key]
+        country_articles = generated[offset:offset + len(topics)]
+        offset += len(topics)
         country_name = "UAE" if country_key == "uae" else "サウジアラビア"
         logger.info("========================================")
-        logger.info("=== %s 旅行記事生成開始 (%d本) ===", country_name, len(topics))
+        logger.info("=== %s 旅行記事生成結果 (%d本) ===", country_name, len(topics))
         logger.info("========================================")
 
-        for i, topic_info in enumerate(topics):
+        for i, (topic_info, article) in enumerate(zip(topics, country_articles)):
             logger.info("[%d/%d] %s", i + 1, len(topics), topic_info["topic"])
 
-            try:
-                article = generate_travel_article(openai_client, country_key, topic_info)
-                logger.info("  → 生成OK: %s (%d文字)", article["title"][:40], len(article["body"]))
-            except Exception as e:
-                logger.error("  → GPT生成失敗: %s", e)
+            if isinstance(article, BaseException):
+                logger.error("  → GPT生成失敗: %s", article)
                 continue
-
-            try:
-                save_travel_article_to_db(db, country_key, topic_info, article)
-                results[country_key] += 1
-                logger.info("  → DB保存完了")
-            except Exception as e:
-                logger.error("  → DB保存失敗: %s", e)
-                continue
-
-            # APIレートリミット対策
-            time.sleep(2)
+            logger.info("  → 生成OK: %s (%d文字)", article["title"][:40], len(article["body"]))
+            rows.append(_db_row(country_key, topic_info, article))
+
+    new_article_ids: list[int] = []
+    try:
+        new_article_ids = [article_id for article_id, _ in db.bulk_insert_articles(rows)]
+    except Exception as e:
+        logger.error("DB保存失敗 (%d本): %s", len(rows), e)
+    else:
+        for row in rows:
+            results[row["article"]["country"]] += 1
+        logger.info("DB保存完了: %d本", len(rows))
 
     db.close()
 
@@ -286,11 +293,15 @@ def main():
     logger.info("  合計: %d 本", total)
     logger.info("========================================")
 
-    # --- サイト生成 ---
+    # --- サイト生成 (追加した記事に関係するページのみ) ---
     logger.info("=== サイト再生成中... ===")
-    SiteGenerator().generate_all()
+    SiteGenerator().regenerate(new_article_ids)
     logger.info("=== 全処理完了! ===")
 
 
+def main():
+    asyncio.run(main_async())
+
+
 if __name__ == "__main__":
     main()
@@ -3,16 +3,18 @@
 DB に保存された当日の published 記事を GPT で要約し、
 既存の TwitterClient を使ってツイートを自動投稿する。
 
-投稿済み記事は JSON ファイルで管理し、二重投稿を防止する。
+投稿済み記事は DB の posted_tweets テーブルで管理し、二重投稿を防止する。
 X 無料プラン（月 1,500 ツイート）を考慮し、1 回あたり最大 20 件、
 各投稿間に 3 分のインターバルを設ける。
 """
 
+import asyncio
+import hashlib
 import json
 import logging
+import re
 import sys
-import time
-from datetime import date, datetime, timezone
+from datetime import date, timedelta
 from pathlib import Path
 from typing import Any
 
@@ -21,6 +23,8 @@ sys.path.insert(0, str(ROOT))
 from dotenv import load_dotenv
 load_dotenv(ROOT / ".env")
 
+from src import gpt
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(message)s",
@@ -36,37 +40,57 @@ MAX_TWEETS_PER_RUN = 20
 TWEET_INTERVAL_SEC = 180  # 3 分
 TWEET_MAX_CHARS = 280
 POSTED_LOG_PATH = ROOT / "data" / "posted_to_x.json"
+TWEET_MODEL = "gpt-4o-mini"
+
+# 生成したツイート本文の llm_cache 名前空間
+_TWEET_NAMESPACE = "x:tweet"
+
+# ツイート要約に渡す本文の最大文字数
+_TWEET_BODY_CHARS = 600
+
+# 記事によらない指示は system に固定し、user には記事と文字数上限だけを渡す
+_TWEET_SYSTEM_PROMPT = (
+    "あなたはConnect-Sekaiという国際ビジネスメディアの公式Xアカウント担当者です。\n"
+    "与えられた記事を元に、Xへの投稿文（日本語）を1つだけ作成してください。\n\n"
+    "【ルール】\n"
+    "- 指定された文字数以内に収める（厳守）\n"
+    "- 読者が記事を読みたくなるような、プロフェッショナルで魅力的な文章にする\n"
+    "- メディアの公式アカウントとして、信頼感のあるトーンで書く\n"
+    "- 絵文字は使わない\n"
+    "- ハッシュタグ・URL は含めない（後で自動付与する）\n"
+    "- 投稿文のみを出力する（説明や注釈は不要）\n"
+)
+
+# カンマ・空白区切りのうち "#" で始まるトークン
+_HASHTAG_RE = re.compile(r"(?<![^\s,])#[^\s,]*")
 
 
 # ---------------------------------------------------------------------------
 # 投稿済み管理
 # ---------------------------------------------------------------------------
 
-def load_posted_ids() -> set[int]:
-    """投稿済み article_id のセットを読み込む。"""
-    if not POSTED_LOG_PATH.exists():
-        return set()
-    try:
-        data = json.loads(POSTED_LOG_PATH.read_text(encoding="utf-8"))
-        return set(data.get("posted_article_ids", []))
-    except (json.JSONDecodeError, KeyError):
-        logger.warning("posted_to_x.json の読み込みに失敗。空として扱います。")
-        return set()
-
-
-def save_posted_id(article_id: int) -> None:
-    """投稿済みリストに article_id を追加して保存する。"""
-    posted = load_posted_ids()
-    posted.add(article_id)
-    data = {
-        "posted_article_ids": sorted(posted),
-        "last_updated": datetime.now(timezone.utc).isoformat(),
-    }
-    POSTED_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    POSTED_LOG_PATH.write_text(
-        json.dumps(data, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+def load_posted_ids(db) -> set[int]:
+    """投稿済み article_id のセットを読み込む。
+
+    旧形式の posted_to_x.json が残っていれば、初回だけ posted_tweets
+    テーブルに取り込んでからリネームする。
+    """
+    if POSTED_LOG_PATH.exists():
+        try:
+            data = json.loads(POSTED_LOG_PATH.read_text(encoding="utf-8"))
+            legacy_ids = data.get("posted_article_ids", [])
+        except (json.JSONDecodeError, AttributeError):
+            logger.warning("posted_to_x.json の読み込みに失敗。取り込みをスキップします。")
+        else:
+            db.mark_tweets_posted(legacy_ids)
+            POSTED_LOG_PATH.replace(POSTED_LOG_PATH.with_suffix(".json.migrated"))
+            logger.info("posted_to_x.json から %d 件を posted_tweets に移行しました。", len(legacy_ids))
+    return db.get_posted_tweet_ids()
+
+
+def save_posted_id(db, article_id: int, tweet_id: str | None = None) -> None:
+    """投稿済みとして article_id を記録する。"""
+    db.mark_tweets_posted([article_id], tweet_id)
 
 
 # ---------------------------------------------------------------------------
@@ -75,14 +99,16 @@ def save_posted_id(article_id: int) -> None:
 
 def fetch_todays_articles(db) -> list[dict[str, Any]]:
     """DB から今日 published になった記事を取得する。"""
-    today_str = date.today().isoformat()
+    today = date.today()
 
+    # created_at は ISO 8601 文字列なので、日付の前方一致は [当日, 翌日) の範囲比較で引ける
     rows = db.conn.execute(
-        """SELECT * FROM articles
+        """SELECT id, title, body, country, hashtags FROM articles
            WHERE status = 'published'
-             AND created_at LIKE ?
+             AND created_at >= ?
+             AND created_at < ?
            ORDER BY id ASC""",
-        (f"{today_str}%",),
+        (today.isoformat(), (today + timedelta(days=1)).isoformat()),
     ).fetchall()
 
     return [dict(r) for r in rows]
@@ -92,20 +118,28 @@ def fetch_todays_articles(db) -> list[dict[str, Any]]:
 # GPT でツイート文を生成
 # ---------------------------------------------------------------------------
 
-def generate_tweet_text(
-    openai_client,
+def _tweet_cache_key(title: str, body: str, max_body_chars: int) -> str:
+    raw = f"{TWEET_MODEL}|{title}|{body}|{max_body_chars}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+async def generate_tweet_text(
     article: dict[str, Any],
+    db=None,
 ) -> str:
-    """GPT を使って記事をツイート用に要約する。"""
+    """GPT を使って記事をツイート用に要約する。
+
+    db を渡した場合は生成した本文を llm_cache に保存し、投稿失敗後の
+    再実行では同じ記事で API を呼ばない。
+    """
     title = article["title"]
-    body = (article.get("body") or "")[:1500]
+    body = (article.get("body") or "")[:_TWEET_BODY_CHARS]
     country = article["country"]
     hashtags_raw = article.get("hashtags") or ""
     article_url = f"{SITE_URL}/{country}/article-{article['id']}.html"
 
     # ハッシュタグは最大 3 つに絞る
-    all_tags = [t.strip() for t in hashtags_raw.replace(",", " ").split() if t.strip().startswith("#")]
-    selected_tags = all_tags[:3]
+    selected_tags = _HASHTAG_RE.findall(hashtags_raw)[:3]
     tags_str = " ".join(selected_tags) if selected_tags else ""
 
     # URL + ハッシュタグ分の文字数を確保してツイート本文の上限を算出
@@ -114,54 +148,77 @@ def generate_tweet_text(
         reserved += len(tags_str) + 1  # タグ + 改行
     max_body_chars = TWEET_MAX_CHARS - reserved - 5  # 余裕を持たせる
 
+    cache_key = _tweet_cache_key(title, body, max_body_chars)
+    hit = db.get_llm_cache(cache_key) if db is not None else None
+    if hit is not None:
+        logger.info("  ツイート文キャッシュヒット")
+        return _compose_tweet(hit["body"], tags_str, article_url)
+
     prompt = (
-        "あなたはConnect-Sekaiという国際ビジネスメディアの公式Xアカウント担当者です。\n"
-        "以下の記事を元に、Xへの投稿文（日本語）を1つだけ作成してください。\n\n"
         f"【記事タイトル】\n{title}\n\n"
         f"【記事本文（抜粋）】\n{body}\n\n"
-        "【ルール】\n"
-        f"- 投稿文は{max_body_chars}文字以内（厳守）\n"
-        "- 読者が記事を読みたくなるような、プロフェッショナルで魅力的な文章にする\n"
-        "- メディアの公式アカウントとして、信頼感のあるトーンで書く\n"
-        "- 絵文字は使わない\n"
-        "- ハッシュタグ・URL は含めない（後で自動付与する）\n"
-        "- 投稿文のみを出力する（説明や注釈は不要）\n"
+        f"投稿文は{max_body_chars}文字以内（厳守）\n"
     )
 
-    response = openai_client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
+    tweet_body = await gpt.complete(
+        prompt,
+        model=TWEET_MODEL,
         max_completion_tokens=300,
         temperature=0.8,
+        system=_TWEET_SYSTEM_PROMPT,
     )
-    tweet_body = (response.choices[0].message.content or "").strip()
 
     # 安全対策: 文字数オーバーを防止
     if len(tweet_body) > max_body_chars:
         tweet_body = tweet_body[: max_body_chars - 1] + "…"
 
-    # 最終的なツイート文を組み立て
+    if db is not None and tweet_body:
+        db.insert_llm_cache(
+            key=cache_key,
+            namespace=_TWEET_NAMESPACE,
+            title=title,
+            body=tweet_body,
+        )
+
+    return _compose_tweet(tweet_body, tags_str, article_url)
+
+
+def _compose_tweet(tweet_body: str, tags_str: str, article_url: str) -> str:
+    """本文・ハッシュタグ・URL から最終的なツイート文を組み立てる。"""
     parts = [tweet_body]
     if tags_str:
         parts.append(tags_str)
     parts.append(article_url)
-    tweet = "\n".join(parts)
+    return "\n".join(parts)
+
+
+def start_tweet_generation(
+    articles: list[dict[str, Any]],
+    db=None,
+) -> list["asyncio.Task[str]"]:
+    """全記事のツイート文生成をタスクとして並列に開始する。
 
-    return tweet
+    同時実行数とレートは src.gpt で制限される。イベントループ内から呼び、
+    結果は記事の順に await する（失敗した記事は await 時に例外を送出する）。
+    """
+    sem = asyncio.Semaphore(gpt.GPT_CONCURRENCY)
+
+    async def _one(article: dict[str, Any]) -> str:
+        async with sem:
+            return await generate_tweet_text(article, db)
+
+    return [asyncio.create_task(_one(article)) for article in articles]
 
 
 # ---------------------------------------------------------------------------
 # メイン処理
 # ---------------------------------------------------------------------------
 
-def main() -> None:
-    from openai import OpenAI
-
+async def main_async() -> None:
     from src.database.models import Database
     from src.sns.twitter import TwitterClient
 
     # --- 初期化 ---
-    openai_client = OpenAI()
     db = Database()
     db.init_db()
     twitter = TwitterClient()
@@ -184,9 +241,9 @@ def main() -> None:
         return
 
     # --- 投稿済みを除外 ---
-    posted_ids = load_posted_ids()
+    posted_ids = load_posted_ids(db)
     unposted = [a for a in articles if a["id"] not in posted_ids]
-    logger.info("未投稿の記事: %d 件 (投稿済み: %d 件)", len(unposted), len(posted_ids & {a["id"] for a in articles}))
+    logger.info("未投稿の記事: %d 件 (投稿済み: %d 件)", len(unposted), len(articles) - len(unposted))
 
     if not unposted:
         logger.info("全記事が投稿済みです。終了します。")
@@ -197,11 +254,16 @@ def main() -> None:
     targets = unposted[:MAX_TWEETS_PER_RUN]
     logger.info("今回の投稿対象: %d 件 (上限: %d)", len(targets), MAX_TWEETS_PER_RUN)
 
+    # --- ツイート文の生成を全件まとめて開始（生成できたものから順に投稿する） ---
+    tweet_tasks = start_tweet_generation(targets, db)
+
     # --- 投稿ループ ---
     success_count = 0
     fail_count = 0
+    loop = asyncio.get_running_loop()
+    next_post_at = loop.time()
 
-    for i, article in enumerate(targets):
+    for i, (article, tweet_task) in enumerate(zip(targets, tweet_tasks)):
         article_id = article["id"]
         title = article["title"]
         logger.info(
@@ -209,33 +271,34 @@ def main() -> None:
             i + 1, len(targets), article_id, title[:50],
         )
 
-        # --- ツイート文を生成 ---
         try:
-            tweet_text = generate_tweet_text(openai_client, article)
-            logger.info("  ツイート文生成OK (%d文字)", len(tweet_text))
-            logger.debug("  内容: %s", tweet_text)
+            tweet_text = await tweet_task
         except Exception as e:
             logger.error("  ツイート文生成失敗: %s", e)
             fail_count += 1
             continue
+        logger.info("  ツイート文生成OK (%d文字)", len(tweet_text))
+        logger.debug("  内容: %s", tweet_text)
+
+        # --- インターバル（前回の投稿成功から TWEET_INTERVAL_SEC 空ける）---
+        wait_sec = next_post_at - loop.time()
+        if wait_sec > 0:
+            logger.info("  投稿まで %.0f 秒待機...", wait_sec)
+            await asyncio.sleep(wait_sec)
 
         # --- 投稿 ---
         try:
-            result = twitter.publish_text_post(tweet_text)
+            result = await asyncio.to_thread(twitter.publish_text_post, tweet_text)
             tweet_id = result.get("data", {}).get("id", "unknown")
             logger.info("  投稿成功! tweet_id=%s", tweet_id)
-            save_posted_id(article_id)
+            save_posted_id(db, article_id, tweet_id)
             success_count += 1
+            next_post_at = loop.time() + TWEET_INTERVAL_SEC
         except Exception as e:
             logger.error("  投稿失敗: %s", e)
             fail_count += 1
             continue
 
-        # --- インターバル（最後の投稿後は不要）---
-        if i < len(targets) - 1:
-            logger.info("  次の投稿まで %d 秒待機...", TWEET_INTERVAL_SEC)
-            time.sleep(TWEET_INTERVAL_SEC)
-
     db.close()
 
     # --- サマリー ---
@@ -247,5 +310,9 @@ def main() -> None:
     logger.info("========================================")
 
 
+def main() -> None:
+    asyncio.run(main_async())
+
+
 if __name__ == "__main__":
     main()
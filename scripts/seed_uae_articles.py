@@ -1,6 +1,5 @@
 """UAE関連記事10本をDBに投入し、静的サイトを生成するシードスクリプト。"""
 
-import sqlite3
 import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -202,80 +201,53 @@ ARTICLES = [
 ]
 
 
-def main():
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-
-    # テーブルが無ければ作成
-    conn.executescript("""
-    CREATE TABLE IF NOT EXISTS news_items (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        country TEXT NOT NULL, title TEXT NOT NULL, url TEXT,
-        source TEXT, summary TEXT, relevance_score REAL DEFAULT 0,
-        collected_at TEXT NOT NULL,
-        status TEXT NOT NULL DEFAULT 'new'
-    );
-    CREATE TABLE IF NOT EXISTS articles (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        news_item_id INTEGER REFERENCES news_items(id),
-        country TEXT NOT NULL, language TEXT NOT NULL,
-        platform TEXT NOT NULL, title TEXT NOT NULL,
-        body TEXT, caption TEXT, hashtags TEXT,
-        has_fomus_mention INTEGER DEFAULT 0,
-        created_at TEXT NOT NULL,
-        status TEXT NOT NULL DEFAULT 'draft'
-    );
-    CREATE TABLE IF NOT EXISTS visual_assets (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        article_id INTEGER REFERENCES articles(id),
-        image_path TEXT NOT NULL, prompt_used TEXT,
-        aspect_ratio TEXT, created_at TEXT NOT NULL
-    );
-    CREATE TABLE IF NOT EXISTS distribution_queue (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        article_id INTEGER REFERENCES articles(id),
-        visual_asset_id INTEGER REFERENCES visual_assets(id),
-        platform TEXT NOT NULL, scheduled_time TEXT NOT NULL,
-        timezone TEXT, published_at TEXT,
-        status TEXT NOT NULL DEFAULT 'pending'
-    );
-    """)
-    conn.commit()
-
-    count = 0
-    for art in ARTICLES:
-        ts = (TODAY - timedelta(days=art["days_ago"])).isoformat()
+def _db_row(art: dict) -> dict:
+    """Database.bulk_insert_articles に渡すシード記事1本分の行を作る。"""
+    ts = (TODAY - timedelta(days=art["days_ago"])).isoformat()
+    return {
+        "news": {
+            "country": "dubai",
+            "title": art["title"],
+            "url": art["source"],
+            "source": art["source"],
+            "summary": art["body"][:200],
+            "relevance_score": 8.5,
+            "collected_at": ts,
+            "status": "processed",
+        },
+        # web, ja, published
+        "article": {
+            "country": "dubai",
+            "language": "ja",
+            "platform": "web",
+            "title": art["title"],
+            "body": art["body"],
+            "caption": art["caption"],
+            "hashtags": art["hashtags"],
+            "has_fomus_mention": art.get("has_fomus", False),
+            "created_at": ts,
+            "status": "published",
+        },
+        # placeholder
+        "asset": {
+            "image_path": "[placeholder]",
+            "prompt_used": f"UAE article: {art['title']}",
+            "aspect_ratio": "1:1",
+            "created_at": ts,
+        },
+    }
 
-        # 1. news_item
-        cur = conn.execute(
-            "INSERT INTO news_items (country,title,url,source,summary,relevance_score,collected_at,status) VALUES (?,?,?,?,?,?,?,?)",
-            ("dubai", art["title"], art["source"], art["source"],
-             art["body"][:200], 8.5, ts, "processed"),
-        )
-        news_id = cur.lastrowid
 
-        # 2. article (web, ja, published)
-        cur = conn.execute(
-            "INSERT INTO articles (news_item_id,country,language,platform,title,body,caption,hashtags,has_fomus_mention,created_at,status) VALUES (?,?,?,?,?,?,?,?,?,?,?)",
-            (news_id, "dubai", "ja", "web", art["title"], art["body"],
-             art["caption"], art["hashtags"],
-             int(art.get("has_fomus", False)), ts, "published"),
-        )
-        article_id = cur.lastrowid
-
-        # 3. visual_asset (placeholder)
-        conn.execute(
-            "INSERT INTO visual_assets (article_id,image_path,prompt_used,aspect_ratio,created_at) VALUES (?,?,?,?,?)",
-            (article_id, f"[placeholder]", f"UAE article: {art['title']}", "1:1", ts),
-        )
+def main():
+    from src.database.models import Database
 
-        count += 1
+    db = Database(DB_PATH)
+    db.init_db()
 
-    conn.commit()
-    conn.close()
-    print(f"✓ {count} 本のUAE記事をDBに投入しました")
+    # 3テーブル分を1トランザクション・テーブルごとに executemany で投入
+    ids = db.bulk_insert_articles([_db_row(art) for art in ARTICLES])
+    db.close()
+    print(f"✓ {len(ids)} 本のUAE記事をDBに投入しました")
 
 
 if __name__ == "__main__":
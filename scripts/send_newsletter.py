@@ -19,14 +19,20 @@ from __future__ import annotations
 
 import logging
 import os
+import queue
 import smtplib
-import sqlite3
-import time
-from datetime import datetime, timezone
+import string
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import email
+from email.charset import Charset
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlencode
 
 from dotenv import load_dotenv
 
@@ -38,6 +44,8 @@ load_dotenv(_ROOT / ".env")
 import sys
 sys.path.insert(0, str(_ROOT))
 
+from src.database.models import Database
+from src.rate_limit import TokenBucket
 from src.subscribers.models import SubscriberDatabase
 
 # ---------------------------------------------------------------------------
@@ -66,8 +74,21 @@ FROM_NAME = os.getenv("NEWSLETTER_FROM_NAME", "Connect-Sekai 編集部")
 
 MAX_EMAILS_PER_RUN = 50
 
+# 並列 SMTP セッション数と、1 セッションで送る最大通数 (超えたら張り直す)
+SMTP_POOL_SIZE = 5
+SMTP_MAX_MESSAGES_PER_CONNECTION = 100
+# 全スレッド合計の送信レート上限 (通/分)。プロバイダの制限に合わせて調整する
+SEND_RATE_PER_MINUTE = int(os.getenv("NEWSLETTER_RATE_PER_MINUTE", "60"))
+# スロットリングで送信レートを下げるときの下限 (通/分)
+MIN_SEND_RATE_PER_MINUTE = 6
+
 DB_PATH = _ROOT / "data" / "connect_nexus.db"
 
+# メールに載せる本文抜粋の文字数と、そのために DB から読む本文の先頭文字数
+# (改行の置換や前後の空白除去で短くなっても抜粋分が残るよう余裕を持たせる)
+_EXCERPT_CHARS = 200
+_EXCERPT_FETCH_CHARS = 400
+
 # 国名マッピング
 COUNTRY_NAMES = {
     "uae": {"ja": "UAE", "icon": "&#127462;&#127466;"},
@@ -82,31 +103,50 @@ COUNTRY_NAMES = {
 # ---------------------------------------------------------------------------
 
 def get_todays_articles() -> dict[str, list[dict[str, Any]]]:
-    """本日公開された記事を国別にグループ化して返す。"""
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    """本日公開された記事を国別にグループ化して返す。
+
+    各記事には表示用の ``excerpt`` (本文抜粋) と ``url`` を付与する。
+    """
+    today = datetime.now(timezone.utc).date()
+    # Database 経由で接続すると共通の PRAGMA (WAL / mmap / キャッシュ) が適用され、
+    # init_db で (language, status, created_at) インデックスも作成される
+    db = Database(DB_PATH)
+    db.init_db()
 
     try:
-        rows = conn.execute(
-            """SELECT id, country, title, body, created_at
+        # 本文は抜粋にしか使わないので、先頭だけを SQLite 側で切り出して受け取る
+        rows = db.conn.execute(
+            """SELECT id, country, title, substr(body, 1, ?) AS body_head, created_at
                FROM articles
                WHERE language = 'ja'
                  AND status IN ('approved', 'scheduled', 'published')
-                 AND created_at LIKE ?
+                 AND created_at >= ?
+                 AND created_at < ?
                ORDER BY country, created_at DESC""",
-            (f"{today}%",),
+            # created_at は ISO 8601 文字列なので、当日分は [当日, 翌日) の範囲で引ける
+            (
+                _EXCERPT_FETCH_CHARS,
+                today.isoformat(),
+                (today + timedelta(days=1)).isoformat(),
+            ),
         ).fetchall()
 
-        grouped: dict[str, list[dict[str, Any]]] = {}
-        for row in rows:
-            d = dict(row)
-            country = d["country"]
-            grouped.setdefault(country, []).append(d)
-
-        return grouped
+        # 行は country 順に並んでいるので、連続する塊ごとにまとめればよい
+        return {
+            country: [_article_entry(row) for row in group]
+            for country, group in groupby(rows, key=itemgetter("country"))
+        }
     finally:
-        conn.close()
+        db.close()
+
+
+def _article_entry(row: Any) -> dict[str, Any]:
+    """DB の行をメール表示用の記事 dict に変換する。"""
+    d = dict(row)
+    # 抜粋と記事 URL は記事ごとに固定なので、取得時に 1 度だけ計算しておく
+    d["excerpt"] = _excerpt(d.pop("body_head") or "", _EXCERPT_CHARS)
+    d["url"] = f"{SITE_URL}/{d['country']}/article-{d['id']}.html"
+    return d
 
 
 # ---------------------------------------------------------------------------
@@ -123,68 +163,10 @@ def _excerpt(text: str, max_len: int = 200) -> str:
     return clean[:max_len] + "..."
 
 
-def build_newsletter_html(
-    articles_by_country: dict[str, list[dict[str, Any]]],
-    unsubscribe_url: str,
-) -> str:
-    """美しい HTML メールを生成する。"""
-    today_str = datetime.now(timezone.utc).strftime("%Y年%m月%d日")
-    total_count = sum(len(arts) for arts in articles_by_country.values())
-
-    # 国別セクションを構築
-    country_sections = ""
-    country_order = ["uae", "saudi", "brunei", "japan"]
-
-    for country_key in country_order:
-        articles = articles_by_country.get(country_key, [])
-        if not articles:
-            continue
-
-        country_info = COUNTRY_NAMES.get(country_key, {"ja": country_key, "icon": ""})
-        country_name = country_info["ja"]
-        country_icon = country_info["icon"]
-
-        article_items = ""
-        for art in articles[:5]:
-            article_url = f"{SITE_URL}/{country_key}/article-{art['id']}.html"
-            excerpt = _excerpt(art.get("body", ""), 200)
-            article_items += f"""
-            <tr>
-                <td style="padding: 16px 0; border-bottom: 1px solid #eee;">
-                    <a href="{article_url}" style="color: #1B2A4A; text-decoration: none; font-size: 16px; font-weight: 600; line-height: 1.5; display: block;">
-                        {art['title']}
-                    </a>
-                    <p style="color: #6B7280; font-size: 14px; line-height: 1.7; margin: 8px 0 0 0;">
-                        {excerpt}
-                    </p>
-                    <a href="{article_url}" style="color: #C9A84C; font-size: 13px; font-weight: 500; text-decoration: none; display: inline-block; margin-top: 8px;">
-                        &#8594; 続きを読む
-                    </a>
-                </td>
-            </tr>"""
+UNSUBSCRIBE_URL_PLACEHOLDER = "__UNSUBSCRIBE_URL__"
 
-        country_sections += f"""
-        <table width="100%" cellpadding="0" cellspacing="0" style="margin-bottom: 24px;">
-            <tr>
-                <td style="padding: 12px 16px; background: linear-gradient(135deg, #1B2A4A 0%, #2a3f6b 100%); border-radius: 6px 6px 0 0;">
-                    <span style="color: #fff; font-size: 18px; font-weight: 700;">
-                        {country_icon} {country_name}
-                    </span>
-                    <span style="color: rgba(255,255,255,0.6); font-size: 13px; margin-left: 8px;">
-                        {len(articles)} 件
-                    </span>
-                </td>
-            </tr>
-            <tr>
-                <td style="padding: 0 16px; background: #fff; border: 1px solid #eee; border-top: none; border-radius: 0 0 6px 6px;">
-                    <table width="100%" cellpadding="0" cellspacing="0">
-                        {article_items}
-                    </table>
-                </td>
-            </tr>
-        </table>"""
-
-    return f"""<!DOCTYPE html>
+# メール全体の外枠。差し込み箇所以外は固定なので、モジュール読み込み時に 1 度だけ解析する
+_NEWSLETTER_TEMPLATE = string.Template("""<!DOCTYPE html>
 <html lang="ja">
 <head>
     <meta charset="UTF-8">
@@ -212,10 +194,10 @@ def build_newsletter_html(
                     <tr>
                         <td style="background: #fff; padding: 24px; border-left: 1px solid #eee; border-right: 1px solid #eee;">
                             <p style="margin: 0; color: #6B7280; font-size: 14px;">
-                                {today_str}のニュースダイジェスト
+                                ${today_str}のニュースダイジェスト
                             </p>
                             <p style="margin: 8px 0 0; color: #1B2A4A; font-size: 16px; font-weight: 600;">
-                                本日の記事: {total_count} 件
+                                本日の記事: ${total_count} 件
                             </p>
                         </td>
                     </tr>
@@ -223,7 +205,7 @@ def build_newsletter_html(
                     <!-- Articles by Country -->
                     <tr>
                         <td style="background: #fff; padding: 8px 24px 24px; border-left: 1px solid #eee; border-right: 1px solid #eee;">
-                            {country_sections}
+                            ${country_sections}
                         </td>
                     </tr>
 
@@ -236,7 +218,7 @@ def build_newsletter_html(
                                         <p style="margin: 0 0 12px; color: #1B2A4A; font-size: 15px; font-weight: 600;">
                                             WhatsApp チャンネルでもお届け中！
                                         </p>
-                                        <a href="{WHATSAPP_CHANNEL_URL}" style="display: inline-block; background: #25D366; color: #fff; padding: 10px 24px; border-radius: 6px; text-decoration: none; font-size: 14px; font-weight: 600;">
+                                        <a href="${whatsapp_channel_url}" style="display: inline-block; background: #25D366; color: #fff; padding: 10px 24px; border-radius: 6px; text-decoration: none; font-size: 14px; font-weight: 600;">
                                             WhatsApp で受け取る
                                         </a>
                                     </td>
@@ -252,7 +234,7 @@ def build_newsletter_html(
                                 このメールは Connect-Sekai ニュースレターの購読者に送信されています。
                             </p>
                             <p style="margin: 8px 0 0;">
-                                <a href="{unsubscribe_url}" style="color: rgba(255,255,255,0.5); font-size: 12px; text-decoration: underline;">
+                                <a href="${unsubscribe_url}" style="color: rgba(255,255,255,0.5); font-size: 12px; text-decoration: underline;">
                                     購読を解除する
                                 </a>
                             </p>
@@ -266,42 +248,271 @@ def build_newsletter_html(
         </tr>
     </table>
 </body>
-</html>"""
+</html>""")
+
+
+def build_newsletter_template(articles_by_country: dict[str, list[dict[str, Any]]]) -> str:
+    """美しい HTML メールのテンプレートを生成する。
+
+    購読者ごとに異なるのは購読解除 URL だけなので、その箇所は
+    ``UNSUBSCRIBE_URL_PLACEHOLDER`` のまま返し、送信時に置換する。
+    """
+    today_str = datetime.now(timezone.utc).strftime("%Y年%m月%d日")
+    total_count = sum(len(arts) for arts in articles_by_country.values())
+
+    # 国別セクションを構築
+    section_parts: list[str] = []
+    country_order = ["uae", "saudi", "brunei", "japan"]
+
+    for country_key in country_order:
+        articles = articles_by_country.get(country_key, [])
+        if not articles:
+            continue
+
+        country_info = COUNTRY_NAMES.get(country_key, {"ja": country_key, "icon": ""})
+        country_name = country_info["ja"]
+        country_icon = country_info["icon"]
+
+        item_parts: list[str] = []
+        for art in articles[:5]:
+            article_url = art["url"]
+            excerpt = art["excerpt"]
+            item_parts.append(f"""
+            <tr>
+                <td style="padding: 16px 0; border-bottom: 1px solid #eee;">
+                    <a href="{article_url}" style="color: #1B2A4A; text-decoration: none; font-size: 16px; font-weight: 600; line-height: 1.5; display: block;">
+                        {art['title']}
+                    </a>
+                    <p style="color: #6B7280; font-size: 14px; line-height: 1.7; margin: 8px 0 0 0;">
+                        {excerpt}
+                    </p>
+                    <a href="{article_url}" style="color: #C9A84C; font-size: 13px; font-weight: 500; text-decoration: none; display: inline-block; margin-top: 8px;">
+                        &#8594; 続きを読む
+                    </a>
+                </td>
+            </tr>""")
+
+        article_items = "".join(item_parts)
+        section_parts.append(f"""
+        <table width="100%" cellpadding="0" cellspacing="0" style="margin-bottom: 24px;">
+            <tr>
+                <td style="padding: 12px 16px; background: linear-gradient(135deg, #1B2A4A 0%, #2a3f6b 100%); border-radius: 6px 6px 0 0;">
+                    <span style="color: #fff; font-size: 18px; font-weight: 700;">
+                        {country_icon} {country_name}
+                    </span>
+                    <span style="color: rgba(255,255,255,0.6); font-size: 13px; margin-left: 8px;">
+                        {len(articles)} 件
+                    </span>
+                </td>
+            </tr>
+            <tr>
+                <td style="padding: 0 16px; background: #fff; border: 1px solid #eee; border-top: none; border-radius: 0 0 6px 6px;">
+                    <table width="100%" cellpadding="0" cellspacing="0">
+                        {article_items}
+                    </table>
+                </td>
+            </tr>
+        </table>""")
+
+    country_sections = "".join(section_parts)
+    return _NEWSLETTER_TEMPLATE.substitute(
+        today_str=today_str,
+        total_count=total_count,
+        country_sections=country_sections,
+        whatsapp_channel_url=WHATSAPP_CHANNEL_URL,
+        unsubscribe_url=UNSUBSCRIBE_URL_PLACEHOLDER,
+    )
 
 
 # ---------------------------------------------------------------------------
 # SMTP 送信
 # ---------------------------------------------------------------------------
 
-def send_email(to_email: str, subject: str, html_body: str) -> bool:
-    """SMTP でメールを送信する。"""
-    if not SMTP_USER or not SMTP_PASSWORD or not FROM_EMAIL:
-        logger.error("SMTP credentials not configured. Set SMTP_USER, SMTP_PASSWORD, NEWSLETTER_FROM_EMAIL.")
-        return False
+def _open_smtp() -> smtplib.SMTP:
+    """SMTP サーバーに接続し、STARTTLS とログインを済ませたセッションを返す。"""
+    server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30)
+    try:
+        server.ehlo()
+        server.starttls()
+        server.ehlo()
+        server.login(SMTP_USER, SMTP_PASSWORD)
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
+def _close_smtp(server: smtplib.SMTP) -> None:
+    """SMTP セッションを閉じる。切断済みでもエラーにしない。"""
+    try:
+        server.quit()
+    except smtplib.SMTPException:
+        server.close()
+
+
+TO_PLACEHOLDER = "__TO__"
+
+# 置換したプレースホルダがそのまま本文に残るよう、base64 ではなく 8bit で送る
+_UTF8_8BIT = Charset("utf-8")
+_UTF8_8BIT.body_encoding = None
 
+
+def build_message_template(subject: str, html_template: str) -> bytes:
+    """全購読者共通の MIME メッセージをエンコード済みバイト列で返す。
+
+    宛先と購読解除 URL はプレースホルダのまま残し、``render_message`` で置換する。
+    """
     msg = MIMEMultipart("alternative")
     msg["Subject"] = subject
     msg["From"] = f"{FROM_NAME} <{FROM_EMAIL}>"
-    msg["To"] = to_email
+    msg["To"] = TO_PLACEHOLDER
 
     # プレーンテキスト版 (fallback)
     plain_text = "Connect-Sekai ニュースレター\n\n最新記事は https://connect-sekai.com でご覧いただけます。"
-    msg.attach(MIMEText(plain_text, "plain", "utf-8"))
-    msg.attach(MIMEText(html_body, "html", "utf-8"))
+    msg.attach(MIMEText(plain_text, "plain", _UTF8_8BIT))
+    msg.attach(MIMEText(html_template, "html", _UTF8_8BIT))
+    return msg.as_bytes()
+
+
+def render_message(message_template: bytes, to_email: str, unsubscribe_url: str) -> bytes:
+    """共通メッセージに購読者ごとの宛先と購読解除 URL を埋め込む。"""
+    return message_template.replace(
+        TO_PLACEHOLDER.encode(), to_email.encode()
+    ).replace(
+        UNSUBSCRIBE_URL_PLACEHOLDER.encode(), unsubscribe_url.encode()
+    )
 
+
+def _to_7bit(message: bytes) -> bytes:
+    """8BITMIME 非対応サーバー向けに、8bit の本文パートを base64 に付け替える。"""
+    msg = email.message_from_bytes(message)
+    for part in msg.walk():
+        if part.get_content_maintype() != "text":
+            continue
+        text = part.get_payload(decode=True).decode("utf-8")
+        del part["Content-Transfer-Encoding"]
+        part.set_payload(text, "utf-8")
+    return msg.as_bytes()
+
+
+def send_email(server: smtplib.SMTP, to_email: str, message: bytes) -> bool:
+    """接続済みの SMTP セッションでエンコード済みメッセージを 1 通送信する。
+
+    8BITMIME 非対応のサーバーには、本文を base64 に付け替えた 7bit のメッセージを送る
+    (RFC 5321 では 8bit データを送れないため)。
+    セッションが切断されていた場合は ``SMTPServerDisconnected`` を、4xx の一時エラーは
+    ``SMTPResponseException`` をそのまま送出し、再接続やレート調整は呼び出し側に任せる。
+    """
+    if server.has_extn("8bitmime"):
+        mail_options = ["BODY=8BITMIME"]
+    else:
+        mail_options = []
+        message = _to_7bit(message)
     try:
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30) as server:
-            server.ehlo()
-            server.starttls()
-            server.ehlo()
-            server.login(SMTP_USER, SMTP_PASSWORD)
-            server.sendmail(FROM_EMAIL, to_email, msg.as_string())
+        server.sendmail(FROM_EMAIL, to_email, message, mail_options)
         return True
+    except smtplib.SMTPServerDisconnected:
+        raise
+    except smtplib.SMTPResponseException as e:
+        # 4xx は一時エラー (レート制限など)。送信レートの調整は呼び出し側で行う
+        if 400 <= e.smtp_code < 500:
+            raise
+        logger.error("Failed to send email to %s: %s", to_email, e)
+        return False
     except Exception as e:
         logger.error("Failed to send email to %s: %s", to_email, e)
         return False
 
 
+class _SMTPPool:
+    """スレッド間で共有する SMTP セッションプール。
+
+    各ワーカーはキューからセッションを 1 本借りて送信し、返却する。
+    セッションは必要になった時点で接続し、``max_messages`` 通ごとに張り直す。
+    送信レートは全ワーカー共通の ``limiter`` で制限し、サーバーが 4xx で
+    スロットリングを返したらレートを半分に下げる。
+    """
+
+    def __init__(self, size: int, max_messages: int, limiter: TokenBucket) -> None:
+        self.max_messages = max_messages
+        self.limiter = limiter
+        self._idle: queue.Queue[tuple[smtplib.SMTP | None, int]] = queue.Queue()
+        for _ in range(size):
+            self._idle.put((None, 0))
+
+    def connect(self) -> None:
+        """最初のセッションを開き、接続設定が正しいことを確認する。"""
+        self._idle.get()
+        try:
+            server = _open_smtp()
+        except Exception:
+            self._idle.put((None, 0))
+            raise
+        self._idle.put((server, 0))
+
+    def send(self, to_email: str, message: bytes) -> bool:
+        """プールのセッションで 1 通送信する。
+
+        サーバーが 4xx でスロットリングを返したら送信レートを半分に下げ、
+        下げたレートで 1 度だけ再送する。
+        """
+        for attempt in range(2):
+            try:
+                return self._send_once(to_email, message)
+            except smtplib.SMTPResponseException as e:
+                rate = self.limiter.slow_down(0.5, min_rate=MIN_SEND_RATE_PER_MINUTE / 60)
+                logger.warning(
+                    "SMTP server throttled %s: %s. Send rate lowered to %.1f/min.%s",
+                    to_email, e, rate * 60, " Retrying once." if attempt == 0 else "",
+                )
+        return False
+
+    def _send_once(self, to_email: str, message: bytes) -> bool:
+        """1 通送信する。途中で切断されたら 1 度だけ再接続する。
+
+        4xx の一時エラーだけは ``SMTPResponseException`` として送出する
+        (セッションはそのままプールに戻す)。それ以外のエラー (認証失敗などの
+        5xx を含む) はセッションを破棄して False を返す。
+        """
+        self.limiter.acquire()
+        server, sent = self._idle.get()
+        try:
+            if server is not None and sent >= self.max_messages:
+                _close_smtp(server)
+                server = None
+            if server is None:
+                server, sent = _open_smtp(), 0
+            try:
+                success = send_email(server, to_email, message)
+            except smtplib.SMTPServerDisconnected:
+                logger.warning("SMTP connection lost. Reconnecting...")
+                server.close()
+                server = None
+                server, sent = _open_smtp(), 0
+                success = send_email(server, to_email, message)
+            sent += 1
+            return success
+        except Exception as e:
+            if isinstance(e, smtplib.SMTPResponseException) and 400 <= e.smtp_code < 500:
+                raise
+            logger.error("Failed to send email to %s: %s", to_email, e)
+            if server is not None:
+                server.close()
+            server = None
+            return False
+        finally:
+            self._idle.put((server, sent))
+
+    def close(self) -> None:
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if server is not None:
+                _close_smtp(server)
+
+
 # ---------------------------------------------------------------------------
 # メイン処理
 # ---------------------------------------------------------------------------
@@ -331,6 +542,22 @@ def main() -> None:
 
     logger.info("Active subscribers: %d", total_subscribers)
 
+    if not SMTP_USER or not SMTP_PASSWORD or not FROM_EMAIL:
+        logger.error("SMTP credentials not configured. Set SMTP_USER, SMTP_PASSWORD, NEWSLETTER_FROM_EMAIL.")
+        sub_db.close()
+        return
+
+    # SMTP セッションはプール内で使い回す (TLS ハンドシェイク + 認証はセッションごとに 1 回だけ)
+    # 送信レートは全ワーカー共通のトークンバケットで制限する
+    limiter = TokenBucket(SEND_RATE_PER_MINUTE / 60, SMTP_POOL_SIZE)
+    pool = _SMTPPool(SMTP_POOL_SIZE, SMTP_MAX_MESSAGES_PER_CONNECTION, limiter)
+    try:
+        pool.connect()
+    except Exception as e:
+        logger.error("Failed to connect to SMTP server %s:%d: %s", SMTP_HOST, SMTP_PORT, e)
+        sub_db.close()
+        return
+
     # 件名
     today_str = datetime.now(timezone.utc).strftime("%Y/%m/%d")
     subject = f"[Connect-Sekai] {today_str} 本日のニュースダイジェスト ({total_articles}件)"
@@ -339,66 +566,72 @@ def main() -> None:
     sent_count = 0
     failed_count = 0
     skipped_count = 0
-    offset = 0
-
-    while offset < total_subscribers and sent_count < MAX_EMAILS_PER_RUN:
-        batch_size = min(MAX_EMAILS_PER_RUN - sent_count, 50)
-        subscribers = sub_db.get_active_subscribers(limit=batch_size, offset=offset)
-
-        if not subscribers:
-            break
-
-        for sub in subscribers:
-            if sent_count >= MAX_EMAILS_PER_RUN:
-                break
-
-            # 本日送信済みならスキップ
-            if sub_db.was_newsletter_sent_today(sub["id"]):
-                skipped_count += 1
-                offset += 1
-                continue
-
-            # 購読解除 URL を構築
-            unsubscribe_url = (
-                f"{SITE_URL}/api/unsubscribe"
-                f"?email={sub['email']}&token={sub['unsubscribe_token']}"
-            )
-
-            # HTML メールを生成
-            html_body = build_newsletter_html(articles_by_country, unsubscribe_url)
-
-            # 送信
-            success = send_email(sub["email"], subject, html_body)
-
-            if success:
-                sub_db.log_newsletter_sent(
-                    subscriber_id=sub["id"],
-                    subject=subject,
-                    article_count=total_articles,
-                    status="sent",
-                )
-                sent_count += 1
-                logger.info("Sent newsletter to: %s", sub["email"])
-            else:
-                sub_db.log_newsletter_sent(
-                    subscriber_id=sub["id"],
-                    subject=subject,
-                    article_count=total_articles,
-                    status="failed",
-                )
-                failed_count += 1
-                logger.warning("Failed to send to: %s", sub["email"])
-
-            # レート制限: 送信間隔 1 秒
-            time.sleep(1)
+    last_id = 0
+    log_buffer: list[dict[str, Any]] = []
 
-            offset += 1
+    # HTML と MIME メッセージは宛先・購読解除 URL 以外共通なので 1 度だけ組み立てる
+    message_template = build_message_template(
+        subject, build_newsletter_template(articles_by_country)
+    )
 
-        # バッチが空でなくても、全員処理済みなら終了
-        if len(subscribers) < batch_size:
-            break
+    # 本日送信済みの購読者は 1 回のクエリでまとめて取得する
+    already_sent = sub_db.get_subscribers_sent_today()
 
-    sub_db.close()
+    try:
+        with ThreadPoolExecutor(max_workers=SMTP_POOL_SIZE) as executor:
+            while sent_count < MAX_EMAILS_PER_RUN:
+                batch_size = min(MAX_EMAILS_PER_RUN - sent_count, 50)
+                subscribers = sub_db.get_active_subscribers_after(last_id, limit=batch_size)
+
+                if not subscribers:
+                    break
+                last_id = subscribers[-1]["id"]
+
+                targets: list[dict[str, Any]] = []
+                emails: list[str] = []
+                messages: list[bytes] = []
+                for sub in subscribers:
+                    # 本日送信済みならスキップ
+                    if sub["id"] in already_sent:
+                        skipped_count += 1
+                        continue
+
+                    # 購読解除 URL を構築 (メールアドレスの + などが壊れないようエンコードする)
+                    query = urlencode({"email": sub["email"], "token": sub["unsubscribe_token"]})
+                    unsubscribe_url = f"{SITE_URL}/api/unsubscribe?{query}"
+
+                    targets.append(sub)
+                    emails.append(sub["email"])
+                    messages.append(render_message(message_template, sub["email"], unsubscribe_url))
+
+                # 送信はワーカースレッドで並列に行い、DB への記録はメインスレッドで
+                # バッチごとにまとめて行う
+                for sub, success in zip(targets, executor.map(pool.send, emails, messages)):
+                    log_buffer.append({
+                        "subscriber_id": sub["id"],
+                        "subject": subject,
+                        "article_count": total_articles,
+                        "status": "sent" if success else "failed",
+                        "sent_at": datetime.now(timezone.utc).isoformat(),
+                    })
+                    if success:
+                        sent_count += 1
+                        logger.info("Sent newsletter to: %s", sub["email"])
+                    else:
+                        failed_count += 1
+                        logger.warning("Failed to send to: %s", sub["email"])
+
+                sub_db.bulk_log_newsletter_sent(log_buffer)
+                log_buffer.clear()
+
+                # バッチが空でなくても、全員処理済みなら終了
+                if len(subscribers) < batch_size:
+                    break
+    finally:
+        pool.close()
+        # 途中で例外が出ても送信済み分のログは残す
+        sub_db.bulk_log_newsletter_sent(log_buffer)
+        sub_db.close()
 
     logger.info(
         "=== Newsletter Sender COMPLETE: sent=%d, failed=%d, skipped=%d ===",
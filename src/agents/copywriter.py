@@ -6,15 +6,24 @@ content with country-appropriate tone and optional FOMUS stealth branding.
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import itertools
 import logging
-import random
 from pathlib import Path
 from typing import Any
 
-import yaml
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    select_autoescape,
+)
 
+from src.agents.fomus import should_include_fomus
 from src.api.openai_client import OpenAIClient
+from src.config import load_countries_config
 from src.content.prompts.system_prompts import (
     COPYWRITER_AR_PROMPT,
     COPYWRITER_EN_PROMPT,
@@ -28,7 +37,12 @@ _PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 CONFIG_PATH = _PROJECT_ROOT / "config" / "countries.yaml"
 
 PLATFORM_LIST = ("instagram", "x", "tiktok")
+# Maximum simultaneous OpenAI caption requests (keeps bursts within the RPM tier)
+CAPTION_CONCURRENCY = 8
 TEMPLATES_DIR = _PROJECT_ROOT / "src" / "content" / "templates"
+# Compiled template bytecode, reused across runs so a fresh process skips
+# Jinja's parse/compile step.
+JINJA_CACHE_DIR = _PROJECT_ROOT / "data" / "cache" / "jinja"
 
 LANGUAGE_PROMPTS: dict[str, str] = {
     "ja": COPYWRITER_JA_PROMPT,
@@ -36,20 +50,62 @@ LANGUAGE_PROMPTS: dict[str, str] = {
     "ar": COPYWRITER_AR_PROMPT,
 }
 
+_TONE_INSTRUCTIONS: dict[str, str] = {
+    "investment-luxury": (
+        "## トーン補足: Investment-Luxury\n"
+        "ドバイを舞台とした投資・節税・ラグジュアリーライフスタイルの文脈で執筆。\n"
+        "不動産ROI、ゴールデンビザ、タックスメリットなど具体的なベネフィットを示唆しつつ、\n"
+        "上質なライフスタイルへの憧れを醸成する。"
+    ),
+    "culture-business": (
+        "## トーン補足: Culture-Business\n"
+        "サウジアラビアのビジョン2030を軸に、日本文化との融合・メガプロジェクトの可能性を発信。\n"
+        "NEOM、紅海プロジェクト、エンタメ産業などの成長セクターに言及し、\n"
+        "日本企業・投資家にとっての商機を知的に提示する。"
+    ),
+    "royal-tradition": (
+        "## トーン補足: Royal-Tradition\n"
+        "ブルネイ王室の伝統と格式を尊重しつつ、日本の伝統工芸・ハラールビジネスとの\n"
+        "接点を探る。「知られざる富裕国」としてのブルネイの魅力を、\n"
+        "品格ある語り口で伝える。"
+    ),
+}
+
 
 class Copywriter:
-    """Generates SNS-ready content from analyzed news articles."""
+    """Generates SNS-ready content from analyzed news articles.
 
-    def __init__(self, config_path: Path = CONFIG_PATH) -> None:
-        with open(config_path, "r", encoding="utf-8") as f:
-            self.config: dict[str, Any] = yaml.safe_load(f)
+    Args:
+        config_path: Path to ``countries.yaml``.
+        db: Optional ``Database``; when given, SNS captions are cached in
+            its ``llm_cache`` table so repeated topics skip the API call.
+    """
+
+    def __init__(self, config_path: Path = CONFIG_PATH, db: Any = None) -> None:
+        self.config: dict[str, Any] = load_countries_config(config_path)
         self.countries: dict[str, dict[str, Any]] = self.config.get("countries", {})
         self.fomus_config: dict[str, Any] = self.config.get("fomus", {})
-        self.openai = OpenAIClient()
+        self.openai = OpenAIClient(cache_db=db)
+        # Templates ship with the package, so compile them once and skip
+        # the per-render mtime checks. Only the HTML article templates are
+        # escaped; the sns_*.txt.j2 captions are plain text, where "&" must
+        # stay "&".
+        JINJA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
         self.jinja_env = Environment(
             loader=FileSystemLoader(str(TEMPLATES_DIR)),
-            autoescape=True,
+            bytecode_cache=FileSystemBytecodeCache(str(JINJA_CACHE_DIR)),
+            autoescape=select_autoescape(enabled_extensions=("html.j2",), default=False),
+            auto_reload=False,
+            cache_size=-1,
         )
+        self._article_templates: dict[str, Template] = {
+            lang: self.jinja_env.get_template(f"article_{lang}.html.j2")
+            for lang in LANGUAGE_PROMPTS
+        }
+        self._sns_templates: dict[str, Template] = {
+            platform: self.jinja_env.get_template(f"sns_{platform}.txt.j2")
+            for platform in PLATFORM_LIST
+        }
 
     # ------------------------------------------------------------------
     # Public API
@@ -72,16 +128,31 @@ class Copywriter:
         Returns:
             Mapping of country_key -> list of generated content dicts.
         """
-        results: dict[str, list[dict[str, Any]]] = {}
+        return asyncio.run(self.agenerate_all(news_data, platforms, languages))
+
+    async def agenerate_all(
+        self,
+        news_data: dict[str, list[dict[str, Any]]],
+        platforms: tuple[str, ...] = PLATFORM_LIST,
+        languages: tuple[str, ...] | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Async version of :meth:`generate_all`.
+
+        Every (article, language, platform) caption request across all
+        countries runs concurrently, bounded by ``CAPTION_CONCURRENCY``.
+        """
+        sem = asyncio.Semaphore(CAPTION_CONCURRENCY)
+        jobs: dict[str, Any] = {}
         for country_key, articles in news_data.items():
             country_cfg = self.countries.get(country_key)
             if not country_cfg:
                 logger.warning("No config for country '%s', skipping", country_key)
                 continue
-            results[country_key] = self._generate_country(
-                country_key, country_cfg, articles, platforms, languages
+            jobs[country_key] = self._generate_country(
+                country_key, country_cfg, articles, platforms, languages, sem
             )
-        return results
+        generated = await asyncio.gather(*jobs.values())
+        return dict(zip(jobs, generated))
 
     def generate_for_article(
         self,
@@ -89,6 +160,8 @@ class Copywriter:
         country_key: str,
         platforms: tuple[str, ...] = PLATFORM_LIST,
         languages: tuple[str, ...] | None = None,
+        article_index: int = 0,
+        total_articles: int = 1,
     ) -> list[dict[str, Any]]:
         """Generate multi-platform content for a single article.
 
@@ -97,15 +170,35 @@ class Copywriter:
             country_key: Country identifier.
             platforms: Target platforms.
             languages: Override language list.
+            article_index: Position of the article within its batch.
+            total_articles: Size of the batch; with ``article_index`` it
+                decides FOMUS insertion (see :meth:`_should_insert_fomus`).
 
         Returns:
             List of content dicts, one per (platform, language) combination.
         """
+        return asyncio.run(
+            self.agenerate_for_article(
+                article, country_key, platforms, languages, article_index, total_articles
+            )
+        )
+
+    async def agenerate_for_article(
+        self,
+        article: dict[str, Any],
+        country_key: str,
+        platforms: tuple[str, ...] = PLATFORM_LIST,
+        languages: tuple[str, ...] | None = None,
+        article_index: int = 0,
+        total_articles: int = 1,
+    ) -> list[dict[str, Any]]:
+        """Async version of :meth:`generate_for_article`."""
         country_cfg = self.countries.get(country_key)
         if not country_cfg:
             raise ValueError(f"Unknown country: {country_key}")
-        return self._generate_for_single_article(
-            article, country_key, country_cfg, platforms, languages
+        return await self._generate_for_single_article(
+            article, country_key, country_cfg, platforms, languages,
+            asyncio.Semaphore(CAPTION_CONCURRENCY), article_index, total_articles,
         )
 
     def render_article(
@@ -124,8 +217,9 @@ class Copywriter:
         Returns:
             Rendered HTML string.
         """
-        template_name = f"article_{language}.html.j2"
-        template = self.jinja_env.get_template(template_name)
+        template = self._article_templates.get(language) or self.jinja_env.get_template(
+            f"article_{language}.html.j2"
+        )
         country_cfg = self.countries.get(country_key, {})
 
         body_text: str = article_data.get("body", "")
@@ -159,8 +253,9 @@ class Copywriter:
         Returns:
             Rendered text string.
         """
-        template_name = f"sns_{platform}.txt.j2"
-        template = self.jinja_env.get_template(template_name)
+        template = self._sns_templates.get(platform) or self.jinja_env.get_template(
+            f"sns_{platform}.txt.j2"
+        )
         return template.render(**content)
 
     def optimize_hashtags(
@@ -194,104 +289,128 @@ class Copywriter:
     # Internal: country-level generation
     # ------------------------------------------------------------------
 
-    def _generate_country(
+    async def _generate_country(
         self,
         country_key: str,
         country_cfg: dict[str, Any],
         articles: list[dict[str, Any]],
         platforms: tuple[str, ...],
         languages: tuple[str, ...] | None,
+        sem: asyncio.Semaphore,
     ) -> list[dict[str, Any]]:
         """Generate content for all articles of a single country."""
-        all_content: list[dict[str, Any]] = []
-        for article in articles:
-            content_items = self._generate_for_single_article(
-                article, country_key, country_cfg, platforms, languages
+        per_article = await asyncio.gather(*[
+            self._generate_for_single_article(
+                article, country_key, country_cfg, platforms, languages, sem,
+                idx, len(articles),
             )
-            all_content.extend(content_items)
+            for idx, article in enumerate(articles)
+        ])
+        all_content = list(itertools.chain.from_iterable(per_article))
         logger.info(
             "%s: generated %d content pieces from %d articles",
             country_key, len(all_content), len(articles),
         )
         return all_content
 
-    def _generate_for_single_article(
+    async def _generate_for_single_article(
         self,
         article: dict[str, Any],
         country_key: str,
         country_cfg: dict[str, Any],
         platforms: tuple[str, ...],
         languages: tuple[str, ...] | None,
+        sem: asyncio.Semaphore,
+        article_index: int,
+        total_articles: int,
     ) -> list[dict[str, Any]]:
-        """Generate content for one article across platforms and languages."""
+        """Generate content for one article across platforms and languages.
+
+        One multi-platform caption request is issued per language, all
+        concurrently; the result keeps the language-major, platform-minor
+        order.
+        """
         tone = country_cfg.get("tone", "")
         country_languages = languages or tuple(country_cfg.get("languages", ["ja"]))
         country_hashtags: dict[str, list[str]] = country_cfg.get("hashtags", {})
 
         # Determine FOMUS insertion for this article
-        insert_fomus = self._should_insert_fomus()
+        insert_fomus = self._should_insert_fomus(article_index, total_articles)
 
         # Build topic string from article data
         topic = self._build_topic_string(article)
-
-        content_items: list[dict[str, Any]] = []
-
-        for lang in country_languages:
-            system_prompt = self._build_system_prompt(lang, tone, insert_fomus)
-            hashtags = country_hashtags.get(lang, [])
-
-            for platform in platforms:
-                logger.debug(
-                    "Generating %s/%s content for '%s' [%s]",
-                    platform, lang, article.get("title", "")[:40], country_key,
-                )
-                sns_content = self.openai.generate_sns_caption(
+        debug = logger.isEnabledFor(logging.DEBUG)
+        short_title = article.get("title", "")[:40] if debug else ""
+
+        async def _captions(lang: str) -> dict[str, dict[str, Any]]:
+            async with sem:
+                if debug:
+                    logger.debug(
+                        "Generating %s content (%s) for '%s' [%s]",
+                        lang, "/".join(platforms), short_title, country_key,
+                    )
+                return await self.openai.agenerate_multi_platform_captions(
                     topic=topic,
-                    platform=platform,
+                    platforms=platforms,
                     tone=tone,
                     language=lang,
-                    hashtags=hashtags,
-                    system_prompt=system_prompt,
+                    hashtags=country_hashtags.get(lang, []),
+                    system_prompt=self._build_system_prompt(lang, tone, insert_fomus),
                 )
-                content_items.append({
-                    "country": country_key,
-                    "brand_name": country_cfg.get("name", ""),
-                    "platform": platform,
-                    "language": lang,
-                    "tone": tone,
-                    "source_article": {
-                        "title": article.get("title", ""),
-                        "link": article.get("link", ""),
-                        "investor_score": article.get("investor_score", {}),
-                    },
-                    "content": sns_content,
-                    "fomus_included": insert_fomus,
-                })
-
-        return content_items
+
+        # One request per language returns every platform's caption
+        per_language = await asyncio.gather(*[_captions(lang) for lang in country_languages])
+
+        # Fields shared by every (language, platform) item of this article;
+        # the items reference one source_article dict instead of copies.
+        base_meta = {
+            "country": country_key,
+            "brand_name": country_cfg.get("name", ""),
+            "tone": tone,
+            "source_article": {
+                "title": article.get("title", ""),
+                "link": article.get("link", ""),
+                "investor_score": article.get("investor_score", {}),
+            },
+            "fomus_included": insert_fomus,
+        }
+        return [
+            {**base_meta, "platform": platform, "language": lang, "content": sns_content}
+            for lang, captions in zip(country_languages, per_language)
+            for platform, sns_content in captions.items()
+        ]
 
     # ------------------------------------------------------------------
     # FOMUS stealth branding
     # ------------------------------------------------------------------
 
-    def _should_insert_fomus(self) -> bool:
-        """Decide whether to include FOMUS branding (20% probability)."""
+    def _should_insert_fomus(self, index: int, total: int) -> bool:
+        """Decide whether the article at ``index`` of ``total`` gets FOMUS branding.
+
+        Uses the schedule shared with CreativeDirector
+        (:func:`src.agents.fomus.should_include_fomus`), so the decision is
+        reproducible, cached captions keep their keys, and branded captions
+        match the branded visuals.
+        """
         if not self.fomus_config.get("stealth_mode", False):
             return False
         ratio = self.fomus_config.get("appearance_ratio", 0.2)
-        return random.random() < ratio
+        return should_include_fomus(index, total, ratio)
 
     # ------------------------------------------------------------------
     # Prompt construction
     # ------------------------------------------------------------------
 
-    def _build_system_prompt(
-        self, language: str, tone: str, include_fomus: bool
-    ) -> str:
-        """Compose the full system prompt based on language, tone, and FOMUS flag."""
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _build_system_prompt(language: str, tone: str, include_fomus: bool) -> str:
+        """Compose the full system prompt based on language, tone, and FOMUS flag.
+
+        Pure in its arguments, so each combination is built once per process.
+        """
         base_prompt = LANGUAGE_PROMPTS.get(language, COPYWRITER_EN_PROMPT)
 
-        tone_instruction = self._get_tone_instruction(tone)
+        tone_instruction = Copywriter._get_tone_instruction(tone)
         prompt_parts = [base_prompt, "", tone_instruction]
 
         if include_fomus:
@@ -302,27 +421,7 @@ class Copywriter:
     @staticmethod
     def _get_tone_instruction(tone: str) -> str:
         """Return a tone-specific writing instruction block."""
-        instructions: dict[str, str] = {
-            "investment-luxury": (
-                "## トーン補足: Investment-Luxury\n"
-                "ドバイを舞台とした投資・節税・ラグジュアリーライフスタイルの文脈で執筆。\n"
-                "不動産ROI、ゴールデンビザ、タックスメリットなど具体的なベネフィットを示唆しつつ、\n"
-                "上質なライフスタイルへの憧れを醸成する。"
-            ),
-            "culture-business": (
-                "## トーン補足: Culture-Business\n"
-                "サウジアラビアのビジョン2030を軸に、日本文化との融合・メガプロジェクトの可能性を発信。\n"
-                "NEOM、紅海プロジェクト、エンタメ産業などの成長セクターに言及し、\n"
-                "日本企業・投資家にとっての商機を知的に提示する。"
-            ),
-            "royal-tradition": (
-                "## トーン補足: Royal-Tradition\n"
-                "ブルネイ王室の伝統と格式を尊重しつつ、日本の伝統工芸・ハラールビジネスとの\n"
-                "接点を探る。「知られざる富裕国」としてのブルネイの魅力を、\n"
-                "品格ある語り口で伝える。"
-            ),
-        }
-        return instructions.get(tone, f"## トーン: {tone}\nこのトーンに合わせて執筆してください。")
+        return _TONE_INSTRUCTIONS.get(tone, f"## トーン: {tone}\nこのトーンに合わせて執筆してください。")
 
     @staticmethod
     def _build_topic_string(article: dict[str, Any]) -> str:
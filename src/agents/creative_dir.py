@@ -2,15 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import re
+from collections import OrderedDict
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-import yaml
-
+from src.agents.fomus import should_include_fomus
 from src.api.gemini_client import GeminiClient
 from src.api.imagen_client import ImagenClient, ImageSize
+from src.config import load_countries_config
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +21,11 @@ _PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 CONFIG_PATH = _PROJECT_ROOT / "config" / "countries.yaml"
 IMAGES_ROOT = _PROJECT_ROOT / "data" / "images"
 
+# Maximum simultaneous Gemini/Imagen requests in aprocess_articles
+VISUAL_CONCURRENCY = 5
+# Gemini image prompts remembered per CreativeDirector, keyed by meta prompt
+IMAGE_PROMPT_CACHE_SIZE = 256
+
 # ---------------------------------------------------------------------------
 # Country-specific visual style guides
 # ---------------------------------------------------------------------------
@@ -83,13 +91,16 @@ class CreativeDirector:
         config_path: Path = CONFIG_PATH,
         images_root: Path = IMAGES_ROOT,
     ) -> None:
-        with open(config_path, "r", encoding="utf-8") as f:
-            self.config = yaml.safe_load(f)
+        self.config = load_countries_config(config_path)
         self.countries: dict[str, dict[str, Any]] = self.config.get("countries", {})
         self.fomus_config: dict[str, Any] = self.config.get("fomus", {})
         self.images_root = images_root
         self.gemini = GeminiClient()
         self.imagen = ImagenClient()
+        # Syndicated news often yields identical meta prompts; answer those
+        # from memory and share in-flight requests instead of re-asking Gemini.
+        self._prompt_cache: OrderedDict[str, str] = OrderedDict()
+        self._pending_prompts: dict[str, asyncio.Task[str]] = {}
 
     # ------------------------------------------------------------------
     # Prompt generation
@@ -109,56 +120,111 @@ class CreativeDirector:
         Returns:
             A fully-formed image prompt string.
         """
+        meta_prompt, fallback = self._image_prompt_request(article, include_fomus)
+        cached = self._cached_prompt(meta_prompt)
+        if cached is not None:
+            return cached
+        result = self.gemini._call_json(meta_prompt, fallback=fallback)
+        return self._remember_prompt(meta_prompt, result, fallback)
+
+    async def abuild_image_prompt(
+        self,
+        article: dict[str, Any],
+        include_fomus: bool = False,
+    ) -> str:
+        """Async version of :meth:`build_image_prompt`.
+
+        Concurrent calls with the same meta prompt share one Gemini request.
+        """
+        meta_prompt, fallback = self._image_prompt_request(article, include_fomus)
+        cached = self._cached_prompt(meta_prompt)
+        if cached is not None:
+            return cached
+
+        pending = self._pending_prompts.get(meta_prompt)
+        if pending is None:
+            pending = asyncio.ensure_future(self._afetch_image_prompt(meta_prompt, fallback))
+            self._pending_prompts[meta_prompt] = pending
+            pending.add_done_callback(lambda _: self._pending_prompts.pop(meta_prompt, None))
+        return await pending
+
+    async def _afetch_image_prompt(self, meta_prompt: str, fallback: dict[str, str]) -> str:
+        result = await self.gemini._acall_json(meta_prompt, fallback=fallback)
+        return self._remember_prompt(meta_prompt, result, fallback)
+
+    def _cached_prompt(self, meta_prompt: str) -> str | None:
+        prompt = self._prompt_cache.get(meta_prompt)
+        if prompt is not None:
+            self._prompt_cache.move_to_end(meta_prompt)
+        return prompt
+
+    def _remember_prompt(
+        self,
+        meta_prompt: str,
+        result: dict[str, Any],
+        fallback: dict[str, str],
+    ) -> str:
+        """Return the prompt from *result*, caching it unless Gemini failed."""
+        prompt = result.get("prompt", fallback["prompt"])
+        if result is not fallback:
+            self._prompt_cache[meta_prompt] = prompt
+            if len(self._prompt_cache) > IMAGE_PROMPT_CACHE_SIZE:
+                self._prompt_cache.popitem(last=False)
+        return prompt
+
+    def _image_prompt_request(
+        self,
+        article: dict[str, Any],
+        include_fomus: bool,
+    ) -> tuple[str, dict[str, str]]:
+        """Build the Gemini meta prompt and the fallback result for an article."""
         country_key: str = article.get("country", "dubai")
         style = VISUAL_STYLES.get(country_key, VISUAL_STYLES["dubai"])
 
         title = article.get("title", "")
-        summary_text = ""
-        if isinstance(article.get("summary"), dict):
-            summary_text = article["summary"].get("summary", "")
-        elif isinstance(article.get("summary"), str):
-            summary_text = article["summary"]
-
-        angle = ""
-        score_data = article.get("investor_score", {})
-        if isinstance(score_data, dict):
-            angle = score_data.get("angle", "")
+        summary = article.get("summary")
+        if isinstance(summary, dict):
+            summary_text = summary.get("summary", "")
+        else:
+            summary_text = summary if isinstance(summary, str) else ""
 
-        content_type = ""
+        score_data = article.get("investor_score")
         if isinstance(score_data, dict):
+            angle = score_data.get("angle", "")
             content_type = score_data.get("content_type", "")
+        else:
+            angle = content_type = ""
 
         # Ask Gemini to craft an optimal visual prompt
-        meta_prompt = (
-            "You are a world-class creative director for a luxury media brand called Connect-Sekai.\n"
-            "Generate a single, detailed image-generation prompt (in English) for a social media visual.\n\n"
-            f"Article title: {title}\n"
-            f"Summary: {summary_text}\n"
-            f"Suggested angle: {angle}\n"
-            f"Content type: {content_type}\n"
-            f"Country/Region: {country_key}\n"
-            f"Visual style keywords: {', '.join(style['keywords'])}\n"
-            f"Color palette: {style['color_palette']}\n"
-            f"Mood: {style['mood']}\n"
-            f"Brand rules: {BRAND_RULES}\n"
-        )
+        parts = [
+            "You are a world-class creative director for a luxury media brand called Connect-Sekai.",
+            "Generate a single, detailed image-generation prompt (in English) for a social media visual.",
+            "",
+            f"Article title: {title}",
+            f"Summary: {summary_text}",
+            f"Suggested angle: {angle}",
+            f"Content type: {content_type}",
+            f"Country/Region: {country_key}",
+            f"Visual style keywords: {', '.join(style['keywords'])}",
+            f"Color palette: {style['color_palette']}",
+            f"Mood: {style['mood']}",
+            f"Brand rules: {BRAND_RULES}",
+        ]
         if include_fomus:
-            meta_prompt += f"FOMUS integration: {FOMUS_VISUAL_RULES}\n"
-
-        meta_prompt += (
-            "\nReturn ONLY a JSON object with these keys:\n"
+            parts.append(f"FOMUS integration: {FOMUS_VISUAL_RULES}")
+        parts += [
+            "",
+            "Return ONLY a JSON object with these keys:",
             '{"prompt": "the full image generation prompt", '
-            '"rationale": "1-sentence explanation of the visual direction"}'
-        )
-
-        result = self.gemini._call_json(
-            meta_prompt,
-            fallback={
-                "prompt": self._fallback_prompt(country_key, title, include_fomus),
-                "rationale": "Fallback prompt based on country visual style.",
-            },
-        )
-        return result.get("prompt", self._fallback_prompt(country_key, title, include_fomus))
+            '"rationale": "1-sentence explanation of the visual direction"}',
+        ]
+        meta_prompt = "\n".join(parts)
+
+        fallback = {
+            "prompt": self._fallback_prompt(country_key, title, include_fomus),
+            "rationale": "Fallback prompt based on country visual style.",
+        }
+        return meta_prompt, fallback
 
     def _fallback_prompt(
         self,
@@ -168,15 +234,16 @@ class CreativeDirector:
     ) -> str:
         """Build a deterministic fallback prompt when Gemini is unavailable."""
         style = VISUAL_STYLES.get(country_key, VISUAL_STYLES["dubai"])
-        base = (
-            f"{style['keywords'][0]}. {style['mood']}. "
-            f"Color palette: {style['color_palette']}. "
-            f"Context: {title}. "
-            f"{BRAND_RULES}"
-        )
+        parts = [
+            f"{style['keywords'][0]}.",
+            f"{style['mood']}.",
+            f"Color palette: {style['color_palette']}.",
+            f"Context: {title}.",
+            BRAND_RULES,
+        ]
         if include_fomus:
-            base += f" {FOMUS_VISUAL_RULES}"
-        return base
+            parts.append(FOMUS_VISUAL_RULES)
+        return " ".join(parts)
 
     # ------------------------------------------------------------------
     # Image generation & saving
@@ -197,30 +264,52 @@ class CreativeDirector:
         Returns:
             List of paths to the saved images.
         """
+        return asyncio.run(self.agenerate_visuals(article, sizes, include_fomus))
+
+    async def agenerate_visuals(
+        self,
+        article: dict[str, Any],
+        sizes: list[ImageSize] | None = None,
+        include_fomus: bool = False,
+        sem: asyncio.Semaphore | None = None,
+    ) -> list[Path]:
+        """Async version of :meth:`generate_visuals`.
+
+        All sizes are generated concurrently. When *sem* is given, every
+        Gemini/Imagen request holds it while in flight.
+        """
         if sizes is None:
             sizes = ["1080x1080"]
+        if sem is None:
+            sem = asyncio.Semaphore(VISUAL_CONCURRENCY)
 
         country_key = article.get("country", "dubai")
-        date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        save_dir = self.images_root / country_key / date_str
 
-        prompt = self.build_image_prompt(article, include_fomus=include_fomus)
+        async with sem:
+            prompt = await self.abuild_image_prompt(article, include_fomus=include_fomus)
         logger.info("Image prompt for [%s]: %s", country_key, prompt[:120])
 
-        saved_paths: list[Path] = []
-        for size in sizes:
-            slug = _slugify(article.get("title", "image"))
-            filename = f"{slug}_{size}.png"
-            dest = save_dir / filename
-
-            try:
-                path = self.imagen.generate_and_save(prompt, dest, size=size)
-                saved_paths.append(path)
-                logger.info("Generated %s image: %s", size, path)
-            except RuntimeError as e:
-                logger.error("Image generation failed (%s, %s): %s", country_key, size, e)
-
-        return saved_paths
+        async def _generate(size: ImageSize) -> Path | None:
+            async with sem:
+                try:
+                    path = await self.imagen.agenerate_and_save(
+                        prompt, self._image_path(article, size), size=size,
+                    )
+                except RuntimeError as e:
+                    logger.error("Image generation failed (%s, %s): %s", country_key, size, e)
+                    return None
+            logger.info("Generated %s image: %s", size, path)
+            return path
+
+        paths = await asyncio.gather(*[_generate(size) for size in sizes])
+        return [path for path in paths if path is not None]
+
+    def _image_path(self, article: dict[str, Any], size: str) -> Path:
+        """Destination path for an article image of the given size."""
+        country_key = article.get("country", "dubai")
+        date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        slug = _slugify(article.get("title", "image"))
+        return self.images_root / country_key / date_str / f"{slug}_{size}.png"
 
     def process_articles(
         self,
@@ -238,44 +327,55 @@ class CreativeDirector:
         Returns:
             {country_key: [saved_image_paths]}
         """
+        return asyncio.run(self.aprocess_articles(articles, top_n=top_n, sizes=sizes))
+
+    async def aprocess_articles(
+        self,
+        articles: dict[str, list[dict[str, Any]]],
+        top_n: int = 3,
+        sizes: list[ImageSize] | None = None,
+    ) -> dict[str, list[Path]]:
+        """Async version of :meth:`process_articles`.
+
+        Every selected article across all countries is visualized
+        concurrently, with at most ``VISUAL_CONCURRENCY`` API requests in
+        flight.
+        """
         if sizes is None:
             sizes = ["1080x1080", "1080x1350"]
 
         fomus_ratio = self.fomus_config.get("appearance_ratio", 0.2)
-        results: dict[str, list[Path]] = {}
+        sem = asyncio.Semaphore(VISUAL_CONCURRENCY)
 
+        jobs: list[tuple[str, Any]] = []
         for country_key, article_list in articles.items():
-            results[country_key] = []
             selected = article_list[:top_n]
 
             for idx, article in enumerate(selected):
                 # Determine FOMUS inclusion based on configured ratio
-                include_fomus = self._should_include_fomus(idx, len(selected), fomus_ratio)
-
-                paths = self.generate_visuals(
-                    article,
-                    sizes=sizes,
-                    include_fomus=include_fomus,
-                )
-                results[country_key].extend(paths)
-
+                include_fomus = should_include_fomus(idx, len(selected), fomus_ratio)
+                jobs.append((
+                    country_key,
+                    self.agenerate_visuals(
+                        article, sizes=sizes, include_fomus=include_fomus, sem=sem,
+                    ),
+                ))
+
+        results: dict[str, list[Path]] = {country_key: [] for country_key in articles}
+        generated = await asyncio.gather(*[job for _, job in jobs])
+        for (country_key, _), paths in zip(jobs, generated):
+            results[country_key].extend(paths)
         return results
 
-    @staticmethod
-    def _should_include_fomus(index: int, total: int, ratio: float) -> bool:
-        """Determine whether a given article index should include FOMUS visuals."""
-        if total == 0 or ratio <= 0:
-            return False
-        # Include FOMUS for the last N articles proportional to the ratio
-        fomus_count = max(1, round(total * ratio))
-        return index >= total - fomus_count
+
+_SLUG_NON_WORD_RE = re.compile(r"[^\w\s-]")
+_SLUG_SEPARATOR_RE = re.compile(r"[\s_]+")
 
 
 def _slugify(text: str, max_len: int = 50) -> str:
     """Create a filesystem-safe slug from text."""
-    import re
-    slug = re.sub(r"[^\w\s-]", "", text.lower())
-    slug = re.sub(r"[\s_]+", "-", slug).strip("-")
+    slug = _SLUG_NON_WORD_RE.sub("", text.lower())
+    slug = _SLUG_SEPARATOR_RE.sub("-", slug).strip("-")
     return slug[:max_len] if slug else "untitled"
 
 
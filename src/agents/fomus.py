@@ -0,0 +1,21 @@
+"""FOMUS stealth-branding schedule shared by the content agents.
+
+Copywriter (captions) and CreativeDirector (visuals) both brand the same
+articles, so a country's FOMUS caption and FOMUS image always line up.
+"""
+
+from __future__ import annotations
+
+
+def should_include_fomus(index: int, total: int, ratio: float) -> bool:
+    """Return whether the article at ``index`` of ``total`` gets FOMUS branding.
+
+    The last ``max(1, round(total * ratio))`` articles are branded, so the
+    decision is deterministic and at least one article per batch carries
+    FOMUS whenever ``ratio`` is positive.
+    """
+    if total == 0 or ratio <= 0:
+        return False
+    # Include FOMUS for the last N articles proportional to the ratio
+    fomus_count = max(1, round(total * ratio))
+    return index >= total - fomus_count
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
 from datetime import datetime, timezone
@@ -25,6 +26,13 @@ DATA_NEWS_DIR = PROJECT_ROOT / "data" / "news"
 MAX_ARTICLES_PER_FEED = 10
 
 
+@functools.lru_cache(maxsize=1)
+def _https_handler() -> urllib.request.HTTPSHandler:
+    """Return the certifi-backed HTTPS handler, building the SSL context once."""
+    ssl_ctx = ssl.create_default_context(cafile=certifi.where())
+    return urllib.request.HTTPSHandler(context=ssl_ctx)
+
+
 class TrendAnalyst:
     """Collects and analyzes news for each configured country."""
 
@@ -92,8 +100,7 @@ class TrendAnalyst:
 
     def _fetch_feeds(self, feed_urls: list[str]) -> list[dict[str, str]]:
         """Parse RSS feeds and return flat list of article dicts."""
-        ssl_ctx = ssl.create_default_context(cafile=certifi.where())
-        handler = urllib.request.HTTPSHandler(context=ssl_ctx)
+        handler = _https_handler()
         articles: list[dict[str, str]] = []
         for url in feed_urls:
             try:
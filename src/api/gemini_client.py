@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import os
 import logging
 from typing import Any
@@ -69,15 +70,27 @@ class GeminiClient:
         """Call Gemini and parse JSON response, with fallback on failure."""
         try:
             response = self.model.generate_content(prompt)
-            text = response.text.strip()
-            # Strip markdown code fences if present
-            if text.startswith("```"):
-                text = text.split("\n", 1)[1] if "\n" in text else text[3:]
-                if text.endswith("```"):
-                    text = text[:-3]
-                text = text.strip()
-            import json
-            return json.loads(text)
+            return self._parse_json(response.text)
         except Exception as e:
             logger.warning("Gemini API call failed: %s", e)
             return fallback
+
+    async def _acall_json(self, prompt: str, fallback: dict[str, Any]) -> dict[str, Any]:
+        """Async version of :meth:`_call_json`."""
+        try:
+            response = await self.model.generate_content_async(prompt)
+            return self._parse_json(response.text)
+        except Exception as e:
+            logger.warning("Gemini API call failed: %s", e)
+            return fallback
+
+    @staticmethod
+    def _parse_json(text: str) -> dict[str, Any]:
+        text = text.strip()
+        # Strip markdown code fences if present
+        if text.startswith("```"):
+            text = text.split("\n", 1)[1] if "\n" in text else text[3:]
+            if text.endswith("```"):
+                text = text[:-3]
+            text = text.strip()
+        return json.loads(text)
@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import io
 import os
 import logging
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
 from dotenv import load_dotenv
 import google.generativeai as genai
@@ -47,28 +48,47 @@ class ImagenClient:
         Raises:
             RuntimeError: If image generation fails.
         """
+        full_prompt, config = self._image_request(prompt, size)
+        try:
+            response = self.model.generate_content(full_prompt, generation_config=config)
+        except Exception as e:
+            raise RuntimeError(f"Image generation API call failed: {e}") from e
+        return self._extract_image(response, size)
+
+    async def agenerate_image(self, prompt: str, size: ImageSize = "1080x1080") -> Image.Image:
+        """Async version of :meth:`generate_image`.
+
+        Decoding and resizing run in a worker thread so the event loop is
+        not blocked.
+        """
+        full_prompt, config = self._image_request(prompt, size)
+        try:
+            response = await self.model.generate_content_async(
+                full_prompt, generation_config=config,
+            )
+        except Exception as e:
+            raise RuntimeError(f"Image generation API call failed: {e}") from e
+        return await asyncio.to_thread(self._extract_image, response, size)
+
+    @staticmethod
+    def _image_request(prompt: str, size: ImageSize) -> tuple[str, genai.GenerationConfig]:
         width, height = SIZE_MAP[size]
         full_prompt = (
             f"{prompt}\n\n"
             f"Image specifications: high quality, photorealistic, "
             f"aspect ratio suitable for {width}x{height} pixels."
         )
+        config = genai.GenerationConfig(response_modalities=["image", "text"])
+        return full_prompt, config
 
-        try:
-            response = self.model.generate_content(
-                full_prompt,
-                generation_config=genai.GenerationConfig(
-                    response_modalities=["image", "text"],
-                ),
-            )
-        except Exception as e:
-            raise RuntimeError(f"Image generation API call failed: {e}") from e
-
+    @staticmethod
+    def _extract_image(response: Any, size: ImageSize) -> Image.Image:
+        """Decode the first image part of a response and resize it to *size*."""
         # Extract image data from the response parts
         for part in response.candidates[0].content.parts:
             if part.inline_data is not None:
                 image = Image.open(io.BytesIO(part.inline_data.data))
-                image = image.resize((width, height), Image.LANCZOS)
+                image = image.resize(SIZE_MAP[size], Image.LANCZOS)
                 return image
 
         raise RuntimeError(
@@ -118,3 +138,14 @@ class ImagenClient:
         """
         image = self.generate_image(prompt, size=size)
         return self.save_image(image, path, fmt=fmt)
+
+    async def agenerate_and_save(
+        self,
+        prompt: str,
+        path: str | Path,
+        size: ImageSize = "1080x1080",
+        fmt: str = "PNG",
+    ) -> Path:
+        """Async version of :meth:`generate_and_save`; the file write runs in a thread."""
+        image = await self.agenerate_image(prompt, size=size)
+        return await asyncio.to_thread(self.save_image, image, path, fmt)
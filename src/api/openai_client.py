@@ -2,27 +2,113 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
 import os
-from typing import Any
+from datetime import datetime, timedelta, timezone
+from typing import Any, Sequence
 
 from dotenv import load_dotenv
-from openai import OpenAI, OpenAIError
+from openai import AsyncOpenAI, OpenAI, OpenAIError
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# llm_cache namespace for parsed SNS caption responses (see OpenAIClient cache_db)
+CAPTION_CACHE_NAMESPACE = "openai:caption"
+
+# ---------------------------------------------------------------------------
+# SNS caption prompt pieces
+# ---------------------------------------------------------------------------
+
+_PLATFORM_RULES: dict[str, str] = {
+    "instagram": (
+        "Instagramカルーセル投稿向け。長めのキャプション（500-800字）で読み応えのある内容。"
+        "改行を効果的に使い、ハッシュタグを末尾にまとめる。"
+    ),
+    "x": (
+        "X (Twitter) 向け。280字以内の鋭く知的なポスト。"
+        "インサイトを凝縮し、続きが気になる構成に。ハッシュタグは最大3個。"
+    ),
+    "tiktok": (
+        "TikTok動画向けナレーション台本。15-60秒で読めるテンポの良い構成。"
+        "フック→本題→CTA の流れで。話し言葉で親しみやすく。"
+    ),
+}
+
+_PLATFORM_OUTPUT_SPECS: dict[str, str] = {
+    "instagram": (
+        '{"caption": "キャプション本文", "hashtags": ["#tag1", "#tag2"], '
+        '"carousel_slides": ["スライド1テキスト", "スライド2テキスト"]}'
+    ),
+    "x": '{"post": "280字以内のポスト", "hashtags": ["#tag1"]}',
+    "tiktok": (
+        '{"hook": "冒頭フック(3秒)", "narration": "ナレーション本文", '
+        '"cta": "CTA文言"}'
+    ),
+}
+
+
+def _caption_system_prompt(tone: str) -> str:
+    return (
+        f"You are a social media specialist for Connect-Sekai. "
+        f"Tone: '{tone}'. Produce refined, exclusive content."
+    )
+
+
+def _caption_fallback(platform: str, topic: str, hashtags: list[str] | None) -> dict[str, Any]:
+    """Content returned for *platform* when the API call fails."""
+    fallbacks = {
+        "instagram": {"caption": topic, "hashtags": hashtags or [], "carousel_slides": []},
+        "x": {"post": topic[:280], "hashtags": hashtags or []},
+        "tiktok": {"hook": "", "narration": topic, "cta": ""},
+    }
+    return fallbacks.get(platform, fallbacks["instagram"])
+
 
 class OpenAIClient:
-    """OpenAI API client for article, SNS caption, and translation tasks."""
+    """OpenAI API client for article, SNS caption, and translation tasks.
+
+    Args:
+        model: Chat model name.
+        cache_db: Optional ``Database``. When given, SNS caption responses
+            are stored in its ``llm_cache`` table keyed by a hash of the
+            model, token limit and messages, and identical caption requests
+            are answered from the cache instead of calling the API.
+        cache_max_age_days: Cached captions older than this are ignored.
+    """
 
-    def __init__(self, model: str = "gpt-5.2") -> None:
+    def __init__(
+        self,
+        model: str = "gpt-5.2",
+        cache_db: Any = None,
+        cache_max_age_days: int = 7,
+    ) -> None:
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY is not set in .env")
         self.client = OpenAI(api_key=api_key)
         self.model = model
+        self.cache_db = cache_db
+        self.cache_max_age_days = cache_max_age_days
+        self._api_key = api_key
+        self._async_client: AsyncOpenAI | None = None
+        self._async_loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """Async client shared by all coroutines on the running event loop.
+
+        Its connection pool is bound to the loop, so a new client is created
+        when called from a different loop (e.g. a later ``asyncio.run``).
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_client = AsyncOpenAI(api_key=self._api_key)
+            self._async_loop = loop
+        return self._async_client
 
     # ------------------------------------------------------------------
     # Article generation
@@ -104,42 +190,95 @@ class OpenAIClient:
         Returns:
             dict with platform-specific content fields.
         """
-        platform_rules = {
-            "instagram": (
-                "Instagramカルーセル投稿向け。長めのキャプション（500-800字）で読み応えのある内容。"
-                "改行を効果的に使い、ハッシュタグを末尾にまとめる。"
-            ),
-            "x": (
-                "X (Twitter) 向け。280字以内の鋭く知的なポスト。"
-                "インサイトを凝縮し、続きが気になる構成に。ハッシュタグは最大3個。"
-            ),
-            "tiktok": (
-                "TikTok動画向けナレーション台本。15-60秒で読めるテンポの良い構成。"
-                "フック→本題→CTA の流れで。話し言葉で親しみやすく。"
-            ),
-        }
-        rule = platform_rules.get(platform, platform_rules["instagram"])
-        hashtag_str = " ".join(hashtags) if hashtags else ""
+        messages, fallback = self._sns_caption_request(
+            topic, platform, tone, language, hashtags, system_prompt
+        )
+        return self._call_json(
+            messages, max_completion_tokens=1500, fallback=fallback, cache=True
+        )
 
-        default_system = (
-            f"You are a social media specialist for Connect-Sekai. "
-            f"Tone: '{tone}'. Produce refined, exclusive content."
+    async def agenerate_sns_caption(
+        self,
+        topic: str,
+        platform: str,
+        tone: str,
+        language: str = "ja",
+        hashtags: list[str] | None = None,
+        system_prompt: str = "",
+    ) -> dict[str, Any]:
+        """Async version of :meth:`generate_sns_caption`."""
+        messages, fallback = self._sns_caption_request(
+            topic, platform, tone, language, hashtags, system_prompt
+        )
+        return await self._acall_json(
+            messages, max_completion_tokens=1500, fallback=fallback, cache=True
+        )
+
+    def generate_multi_platform_captions(
+        self,
+        topic: str,
+        platforms: Sequence[str],
+        tone: str,
+        language: str = "ja",
+        hashtags: list[str] | None = None,
+        system_prompt: str = "",
+    ) -> dict[str, dict[str, Any]]:
+        """Generate captions for several platforms in a single request.
+
+        Args:
+            topic: The content subject or article summary.
+            platforms: Platforms to write for ('instagram', 'x', 'tiktok').
+            tone: Country tone identifier.
+            language: Target language code.
+            hashtags: Suggested hashtags to include.
+            system_prompt: Optional system prompt override.
+
+        Returns:
+            Mapping of platform -> content dict (same shape as
+            :meth:`generate_sns_caption`). Platforms missing from the
+            response get the per-platform fallback.
+        """
+        messages = self._multi_caption_messages(
+            topic, platforms, tone, language, hashtags, system_prompt
+        )
+        result = self._call_json(
+            messages, max_completion_tokens=1500 * len(platforms), cache=True
+        )
+        return self._split_captions(result, topic, platforms, hashtags)
+
+    async def agenerate_multi_platform_captions(
+        self,
+        topic: str,
+        platforms: Sequence[str],
+        tone: str,
+        language: str = "ja",
+        hashtags: list[str] | None = None,
+        system_prompt: str = "",
+    ) -> dict[str, dict[str, Any]]:
+        """Async version of :meth:`generate_multi_platform_captions`."""
+        messages = self._multi_caption_messages(
+            topic, platforms, tone, language, hashtags, system_prompt
         )
+        result = await self._acall_json(
+            messages, max_completion_tokens=1500 * len(platforms), cache=True
+        )
+        return self._split_captions(result, topic, platforms, hashtags)
 
-        output_spec = {
-            "instagram": (
-                '{"caption": "キャプション本文", "hashtags": ["#tag1", "#tag2"], '
-                '"carousel_slides": ["スライド1テキスト", "スライド2テキスト"]}'
-            ),
-            "x": '{"post": "280字以内のポスト", "hashtags": ["#tag1"]}',
-            "tiktok": (
-                '{"hook": "冒頭フック(3秒)", "narration": "ナレーション本文", '
-                '"cta": "CTA文言"}'
-            ),
-        }
+    @staticmethod
+    def _sns_caption_request(
+        topic: str,
+        platform: str,
+        tone: str,
+        language: str,
+        hashtags: list[str] | None,
+        system_prompt: str,
+    ) -> tuple[list[dict[str, str]], dict[str, Any]]:
+        """Build the chat messages and fallback result for an SNS caption."""
+        rule = _PLATFORM_RULES.get(platform, _PLATFORM_RULES["instagram"])
+        hashtag_str = " ".join(hashtags) if hashtags else ""
 
         messages = [
-            {"role": "system", "content": system_prompt or default_system},
+            {"role": "system", "content": system_prompt or _caption_system_prompt(tone)},
             {
                 "role": "user",
                 "content": (
@@ -149,21 +288,64 @@ class OpenAIClient:
                     f"ルール: {rule}\n"
                     f"推奨ハッシュタグ: {hashtag_str}\n"
                     f"言語: {language}\n\n"
-                    f"出力形式 (JSONのみ):\n{output_spec.get(platform, output_spec['instagram'])}"
+                    f"出力形式 (JSONのみ):\n"
+                    f"{_PLATFORM_OUTPUT_SPECS.get(platform, _PLATFORM_OUTPUT_SPECS['instagram'])}"
                 ),
             },
         ]
+        return messages, _caption_fallback(platform, topic, hashtags)
 
-        fallbacks = {
-            "instagram": {"caption": topic, "hashtags": hashtags or [], "carousel_slides": []},
-            "x": {"post": topic[:280], "hashtags": hashtags or []},
-            "tiktok": {"hook": "", "narration": topic, "cta": ""},
-        }
-        return self._call_json(
-            messages,
-            max_completion_tokens=1500,
-            fallback=fallbacks.get(platform, fallbacks["instagram"]),
+    @staticmethod
+    def _multi_caption_messages(
+        topic: str,
+        platforms: Sequence[str],
+        tone: str,
+        language: str,
+        hashtags: list[str] | None,
+        system_prompt: str,
+    ) -> list[dict[str, str]]:
+        """Build the chat messages asking for every platform's caption at once."""
+        hashtag_str = " ".join(hashtags) if hashtags else ""
+        rules = "\n".join(
+            f"- {platform}: {_PLATFORM_RULES.get(platform, _PLATFORM_RULES['instagram'])}"
+            for platform in platforms
         )
+        output_spec = ", ".join(
+            f'"{platform}": '
+            f"{_PLATFORM_OUTPUT_SPECS.get(platform, _PLATFORM_OUTPUT_SPECS['instagram'])}"
+            for platform in platforms
+        )
+        return [
+            {"role": "system", "content": system_prompt or _caption_system_prompt(tone)},
+            {
+                "role": "user",
+                "content": (
+                    f"以下のトピックから、各プラットフォーム向けのSNS投稿をそれぞれ作成してください。\n\n"
+                    f"トピック: {topic}\n"
+                    f"プラットフォーム別ルール:\n{rules}\n"
+                    f"推奨ハッシュタグ: {hashtag_str}\n"
+                    f"言語: {language}\n\n"
+                    f"出力形式 (JSONのみ、プラットフォーム名をキーにする):\n{{{output_spec}}}"
+                ),
+            },
+        ]
+
+    @staticmethod
+    def _split_captions(
+        result: dict[str, Any],
+        topic: str,
+        platforms: Sequence[str],
+        hashtags: list[str] | None,
+    ) -> dict[str, dict[str, Any]]:
+        """Pick each platform's caption out of a multi-platform response."""
+        captions: dict[str, dict[str, Any]] = {}
+        for platform in platforms:
+            content = result.get(platform)
+            if not isinstance(content, dict) or not content:
+                logger.warning("No %s caption in multi-platform response; using fallback", platform)
+                content = _caption_fallback(platform, topic, hashtags)
+            captions[platform] = content
+        return captions
 
     # ------------------------------------------------------------------
     # Translation
@@ -280,8 +462,16 @@ class OpenAIClient:
         messages: list[dict[str, str]],
         max_completion_tokens: int = 4000,
         fallback: dict[str, Any] | None = None,
+        cache: bool = False,
     ) -> dict[str, Any]:
-        """Send a chat completion request and parse the JSON response."""
+        """Send a chat completion request and parse the JSON response.
+
+        With ``cache=True`` the response goes through ``cache_db`` (if set).
+        """
+        key = self._cache_key(messages, max_completion_tokens) if cache else None
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
@@ -290,32 +480,97 @@ class OpenAIClient:
                 temperature=0.7,
                 response_format={"type": "json_object"},
             )
-            text = response.choices[0].message.content or ""
-            text = text.strip()
-            # Strip markdown code fences if present
-            if text.startswith("```"):
-                # Remove opening fence (```json or ```)
-                first_newline = text.find("\n")
-                text = text[first_newline + 1:] if first_newline != -1 else text[3:]
-                # Remove closing fence
-                if text.rstrip().endswith("```"):
-                    text = text.rstrip()[:-3]
-                text = text.strip()
-            # Try to extract JSON object from response
-            if not text.startswith("{"):
-                start = text.find("{")
-                if start != -1:
-                    # Find matching closing brace
-                    depth = 0
-                    for idx in range(start, len(text)):
-                        if text[idx] == "{":
-                            depth += 1
-                        elif text[idx] == "}":
-                            depth -= 1
-                            if depth == 0:
-                                text = text[start:idx + 1]
-                                break
-            return json.loads(text)
+            result = self._parse_json(response.choices[0].message.content or "")
+        except (OpenAIError, json.JSONDecodeError) as e:
+            logger.warning("OpenAI API call failed: %s", e)
+            return fallback if fallback is not None else {}
+        self._cache_put(key, messages, result)
+        return result
+
+    async def _acall_json(
+        self,
+        messages: list[dict[str, str]],
+        max_completion_tokens: int = 4000,
+        fallback: dict[str, Any] | None = None,
+        cache: bool = False,
+    ) -> dict[str, Any]:
+        """Async version of :meth:`_call_json`."""
+        key = self._cache_key(messages, max_completion_tokens) if cache else None
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_completion_tokens=max_completion_tokens,
+                temperature=0.7,
+                response_format={"type": "json_object"},
+            )
+            result = self._parse_json(response.choices[0].message.content or "")
         except (OpenAIError, json.JSONDecodeError) as e:
             logger.warning("OpenAI API call failed: %s", e)
             return fallback if fallback is not None else {}
+        self._cache_put(key, messages, result)
+        return result
+
+    def _cache_key(self, messages: list[dict[str, str]], max_completion_tokens: int) -> str:
+        raw = json.dumps(
+            [self.model, max_completion_tokens, messages], ensure_ascii=False, sort_keys=True
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str | None) -> dict[str, Any] | None:
+        if self.cache_db is None or key is None:
+            return None
+        since = (
+            datetime.now(timezone.utc) - timedelta(days=self.cache_max_age_days)
+        ).isoformat()
+        hit = self.cache_db.get_llm_cache(key, since=since)
+        if hit is None:
+            return None
+        try:
+            return json.loads(hit["body"])
+        except json.JSONDecodeError:
+            return None
+
+    def _cache_put(
+        self, key: str | None, messages: list[dict[str, str]], result: dict[str, Any]
+    ) -> None:
+        if self.cache_db is None or key is None or not result:
+            return
+        self.cache_db.insert_llm_cache(
+            key=key,
+            namespace=CAPTION_CACHE_NAMESPACE,
+            title=messages[-1]["content"][:80],
+            body=json.dumps(result, ensure_ascii=False),
+        )
+
+    @staticmethod
+    def _parse_json(text: str) -> dict[str, Any]:
+        """Parse a JSON object from a model response, tolerating code fences."""
+        text = text.strip()
+        # Strip markdown code fences if present
+        if text.startswith("```"):
+            # Remove opening fence (```json or ```)
+            first_newline = text.find("\n")
+            text = text[first_newline + 1:] if first_newline != -1 else text[3:]
+            # Remove closing fence
+            if text.rstrip().endswith("```"):
+                text = text.rstrip()[:-3]
+            text = text.strip()
+        # Try to extract JSON object from response
+        if not text.startswith("{"):
+            start = text.find("{")
+            if start != -1:
+                # Find matching closing brace
+                depth = 0
+                for idx in range(start, len(text)):
+                    if text[idx] == "{":
+                        depth += 1
+                    elif text[idx] == "}":
+                        depth -= 1
+                        if depth == 0:
+                            text = text[start:idx + 1]
+                            break
+        return json.loads(text)
@@ -0,0 +1,85 @@
+"""Shared access to ``config/countries.yaml``.
+
+The agents used to parse countries.yaml in every constructor; the file
+only changes between deployments, so it is parsed once per process and
+the same dict is handed to every caller. Treat the result as read-only.
+
+YAML stays the source of truth, but each parse is also written as a JSON
+snapshot under ``data/cache/config``. A fresh process loads that snapshot
+(tens of times faster than YAML) as long as the YAML file's mtime still
+matches the one recorded in it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CONFIG_PATH = _PROJECT_ROOT / "config" / "countries.yaml"
+SNAPSHOT_DIR = _PROJECT_ROOT / "data" / "cache" / "config"
+
+# libyaml's C loader is several times faster; fall back to the pure-Python
+# loader when PyYAML was built without it.
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _snapshot_path(path: Path) -> Path:
+    digest = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:12]
+    return SNAPSHOT_DIR / f"{path.stem}_{digest}.json"
+
+
+def _read_snapshot(snapshot: Path, mtime_ns: int) -> dict[str, Any] | None:
+    try:
+        cached = json.loads(snapshot.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if cached.get("mtime_ns") != mtime_ns:
+        return None
+    return cached.get("config")
+
+
+def _write_snapshot(snapshot: Path, mtime_ns: int, config: dict[str, Any]) -> None:
+    try:
+        payload = json.dumps({"mtime_ns": mtime_ns, "config": config}, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return
+    # YAML allows non-string keys; skip the snapshot if JSON would alter them.
+    if json.loads(payload)["config"] != config:
+        return
+    tmp = snapshot.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, snapshot)
+    except OSError as e:
+        logger.debug("Could not write config snapshot %s: %s", snapshot, e)
+        tmp.unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=8)
+def _load_yaml(path: Path) -> dict[str, Any]:
+    mtime_ns = path.stat().st_mtime_ns
+    snapshot = _snapshot_path(path)
+    config = _read_snapshot(snapshot, mtime_ns)
+    if config is not None:
+        return config
+
+    with open(path, "r", encoding="utf-8") as f:
+        config = yaml.load(f, Loader=_SafeLoader) or {}
+    _write_snapshot(snapshot, mtime_ns, config)
+    return config
+
+
+def load_countries_config(config_path: Path = CONFIG_PATH) -> dict[str, Any]:
+    """Return the parsed countries.yaml, loaded once per path per process."""
+    return _load_yaml(Path(config_path).resolve())
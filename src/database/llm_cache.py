@@ -0,0 +1,121 @@
+"""Response cache for GPT article rewrites.
+
+Rewrites are looked up by a hash of the normalized source news
+(namespace + title + description prefix), so only the same news item
+reuses a cached article. Similar-but-different stories (e.g. the same
+headline for another quarter) always get a fresh rewrite.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", text).strip().lower()
+
+
+def cache_key(namespace: str, title: str, description: str) -> str:
+    """Return the exact-match cache key for a source news item."""
+    raw = f"{namespace}|{_normalize(title)}|{_normalize(description)[:200]}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class RewriteCache:
+    """SQLite-backed exact-match cache for GPT rewrites.
+
+    Args:
+        db: ``Database`` instance holding the ``llm_cache`` table.
+        enabled: When False, every lookup is a miss and nothing is stored.
+        max_age_days: Entries older than this are ignored and regenerated.
+    """
+
+    def __init__(
+        self,
+        db: Any,
+        enabled: bool = True,
+        max_age_days: int = 30,
+    ) -> None:
+        self.db = db
+        self.enabled = enabled
+        self.max_age_days = max_age_days
+
+    def _lookup(
+        self, namespace: str, title: str, description: str,
+    ) -> tuple[Optional[dict[str, Any]], str]:
+        """Return ``(hit, key)``; *hit* is None on a miss."""
+        key = cache_key(namespace, title, description)
+        since = (datetime.now(timezone.utc) - timedelta(days=self.max_age_days)).isoformat()
+        hit = self.db.get_llm_cache(key, since=since)
+        if hit is None:
+            return None, key
+        logger.info("    → キャッシュヒット: %s", title[:40])
+        return {"title": hit["title"], "body": hit["body"]}, key
+
+    def _store(self, key: str, namespace: str, result: dict[str, Any]) -> None:
+        self.db.insert_llm_cache(
+            key=key,
+            namespace=namespace,
+            title=result["title"],
+            body=result["body"],
+        )
+
+    async def get_or_create(
+        self,
+        namespace: str,
+        title: str,
+        description: str,
+        factory: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        """Return a cached ``{"title", "body"}`` rewrite or call *factory*.
+
+        The factory's result is stored under the exact key.
+        """
+        if not self.enabled:
+            return await factory()
+
+        hit, key = self._lookup(namespace, title, description)
+        if hit is not None:
+            return hit
+
+        result = await factory()
+        self._store(key, namespace, result)
+        return result
+
+    async def get_or_create_many(
+        self,
+        namespace: str,
+        items: Sequence[tuple[str, str]],
+        factory: Callable[
+            [list[tuple[str, str]]], Awaitable[list[Union[dict[str, Any], BaseException]]]
+        ],
+    ) -> list[Union[dict[str, Any], BaseException]]:
+        """Batch version of :meth:`get_or_create` for ``(title, description)`` items.
+
+        *factory* is called once with the cache misses and must return one
+        result (or exception) per miss, in order. Exceptions are passed
+        through to the caller and not cached.
+        """
+        if not self.enabled:
+            return await factory(list(items))
+
+        lookups = [self._lookup(namespace, title, description) for title, description in items]
+        results: list[Union[dict[str, Any], BaseException, None]] = [
+            hit for hit, _ in lookups
+        ]
+        misses = [i for i, hit in enumerate(results) if hit is None]
+        if misses:
+            created = await factory([items[i] for i in misses])
+            for i, result in zip(misses, created):
+                results[i] = result
+                if not isinstance(result, BaseException):
+                    self._store(lookups[i][1], namespace, result)
+        return results  # type: ignore[return-value]
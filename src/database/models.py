@@ -5,9 +5,11 @@ from __future__ import annotations
 import json
 import logging
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Iterator, Optional, Sequence
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +34,11 @@ CREATE TABLE IF NOT EXISTS news_items (
         CHECK (status IN ('new', 'processed', 'archived'))
 );
 
+CREATE INDEX IF NOT EXISTS idx_news_items_country_title
+    ON news_items (country, title);
+CREATE INDEX IF NOT EXISTS idx_news_items_country_url
+    ON news_items (country, url);
+
 CREATE TABLE IF NOT EXISTS articles (
     id              INTEGER PRIMARY KEY AUTOINCREMENT,
     news_item_id    INTEGER REFERENCES news_items(id),
@@ -48,6 +55,15 @@ CREATE TABLE IF NOT EXISTS articles (
         CHECK (status IN ('draft', 'approved', 'scheduled', 'published'))
 );
 
+CREATE INDEX IF NOT EXISTS idx_articles_status_country
+    ON articles (status, country, id);
+CREATE INDEX IF NOT EXISTS idx_articles_platform_created
+    ON articles (platform, created_at, status);
+CREATE INDEX IF NOT EXISTS idx_articles_status_created
+    ON articles (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_articles_language_status_created
+    ON articles (language, status, created_at);
+
 CREATE TABLE IF NOT EXISTS visual_assets (
     id              INTEGER PRIMARY KEY AUTOINCREMENT,
     article_id      INTEGER REFERENCES articles(id),
@@ -57,6 +73,9 @@ CREATE TABLE IF NOT EXISTS visual_assets (
     created_at      TEXT    NOT NULL
 );
 
+CREATE INDEX IF NOT EXISTS idx_visual_assets_article
+    ON visual_assets (article_id);
+
 CREATE TABLE IF NOT EXISTS distribution_queue (
     id              INTEGER PRIMARY KEY AUTOINCREMENT,
     article_id      INTEGER REFERENCES articles(id),
@@ -68,9 +87,39 @@ CREATE TABLE IF NOT EXISTS distribution_queue (
     status          TEXT    NOT NULL DEFAULT 'pending'
         CHECK (status IN ('pending', 'published', 'failed'))
 );
+
+CREATE TABLE IF NOT EXISTS posted_tweets (
+    article_id      INTEGER PRIMARY KEY,
+    tweet_id        TEXT,
+    posted_at       TEXT    NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key             TEXT    PRIMARY KEY,
+    namespace       TEXT    NOT NULL,
+    title           TEXT    NOT NULL,
+    body            TEXT,
+    created_at      TEXT    NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_cache_namespace_created
+    ON llm_cache (namespace, created_at);
 """
 
 
+# Applied on every connection. WAL is persisted in the file; the rest are
+# per-connection. Under WAL, synchronous=NORMAL can lose the last commits on
+# power loss but never corrupts the database.
+_CONNECTION_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "cache_size=-20000",
+    "foreign_keys=ON",
+)
+
+
 class Database:
     """Thin wrapper around SQLite for Connect-Sekai data operations."""
 
@@ -78,6 +127,7 @@ class Database:
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._conn: Optional[sqlite3.Connection] = None
+        self._tx_depth = 0
 
     # ------------------------------------------------------------------
     # Connection helpers
@@ -86,10 +136,10 @@ class Database:
     @property
     def conn(self) -> sqlite3.Connection:
         if self._conn is None:
-            self._conn = sqlite3.connect(str(self.db_path))
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
             self._conn.row_factory = sqlite3.Row
-            self._conn.execute("PRAGMA journal_mode=WAL")
-            self._conn.execute("PRAGMA foreign_keys=ON")
+            for pragma in _CONNECTION_PRAGMAS:
+                self._conn.execute(f"PRAGMA {pragma}")
         return self._conn
 
     def close(self) -> None:
@@ -97,6 +147,32 @@ class Database:
             self._conn.close()
             self._conn = None
 
+    def _commit(self) -> None:
+        """Commit unless an enclosing :meth:`transaction` will do it."""
+        if not self._tx_depth:
+            self.conn.commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Group several CRUD calls into a single BEGIN ... COMMIT.
+
+        Per-call commits inside the block are deferred; the whole block
+        is rolled back if it raises. Nested blocks join the outer one.
+        """
+        conn = self.conn
+        self._tx_depth += 1
+        try:
+            yield conn
+        except BaseException:
+            if self._tx_depth == 1:
+                conn.rollback()
+            raise
+        else:
+            if self._tx_depth == 1:
+                conn.commit()
+        finally:
+            self._tx_depth -= 1
+
     # ------------------------------------------------------------------
     # Initialization
     # ------------------------------------------------------------------
@@ -104,6 +180,8 @@ class Database:
     def init_db(self) -> None:
         """Create all tables if they do not exist."""
         self.conn.executescript(_SCHEMA_SQL)
+        # Refresh planner statistics when they are missing or stale (cheap no-op otherwise)
+        self.conn.execute("PRAGMA optimize")
         self.conn.commit()
         logger.info("Database initialized at %s", self.db_path)
 
@@ -119,12 +197,13 @@ class Database:
         source: str = "",
         summary: str = "",
         relevance_score: float = 0,
+        status: str = "new",
     ) -> int:
         """Insert a news item and return its id."""
         cur = self.conn.execute(
             """INSERT INTO news_items
-               (country, title, url, source, summary, relevance_score, collected_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+               (country, title, url, source, summary, relevance_score, collected_at, status)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
             (
                 country,
                 title,
@@ -133,9 +212,10 @@ class Database:
                 summary,
                 relevance_score,
                 _now(),
+                status,
             ),
         )
-        self.conn.commit()
+        self._commit()
         return cur.lastrowid  # type: ignore[return-value]
 
     def get_news_items(
@@ -166,11 +246,21 @@ class Database:
         ).fetchone()
         return dict(row) if row else None
 
+    def news_exists(self, country: str, title: str, url: str = "") -> bool:
+        """Return True if a news item with the same title or URL was already stored."""
+        row = self.conn.execute(
+            """SELECT 1 FROM news_items
+               WHERE country = ? AND (title = ? OR (? != '' AND url = ?))
+               LIMIT 1""",
+            (country, title, url, url),
+        ).fetchone()
+        return row is not None
+
     def update_news_status(self, news_id: int, status: str) -> None:
         self.conn.execute(
             "UPDATE news_items SET status = ? WHERE id = ?", (status, news_id)
         )
-        self.conn.commit()
+        self._commit()
 
     # ------------------------------------------------------------------
     # articles CRUD
@@ -187,12 +277,13 @@ class Database:
         caption: str = "",
         hashtags: str = "",
         has_fomus_mention: bool = False,
+        status: str = "draft",
     ) -> int:
         cur = self.conn.execute(
             """INSERT INTO articles
                (news_item_id, country, language, platform, title, body,
-                caption, hashtags, has_fomus_mention, created_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                caption, hashtags, has_fomus_mention, created_at, status)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
             (
                 news_item_id,
                 country,
@@ -204,9 +295,10 @@ class Database:
                 hashtags,
                 int(has_fomus_mention),
                 _now(),
+                status,
             ),
         )
-        self.conn.commit()
+        self._commit()
         return cur.lastrowid  # type: ignore[return-value]
 
     def get_articles(
@@ -244,7 +336,7 @@ class Database:
         self.conn.execute(
             "UPDATE articles SET status = ? WHERE id = ?", (status, article_id)
         )
-        self.conn.commit()
+        self._commit()
 
     # ------------------------------------------------------------------
     # visual_assets CRUD
@@ -263,9 +355,15 @@ class Database:
                VALUES (?, ?, ?, ?, ?)""",
             (article_id, image_path, prompt_used, aspect_ratio, _now()),
         )
-        self.conn.commit()
+        self._commit()
         return cur.lastrowid  # type: ignore[return-value]
 
+    def update_visual_asset_image(self, asset_id: int, image_path: str) -> None:
+        self.conn.execute(
+            "UPDATE visual_assets SET image_path = ? WHERE id = ?", (image_path, asset_id)
+        )
+        self._commit()
+
     def get_visual_assets(
         self,
         article_id: Optional[int] = None,
@@ -289,6 +387,106 @@ class Database:
         ).fetchone()
         return dict(row) if row else None
 
+    # ------------------------------------------------------------------
+    # Bulk insert
+    # ------------------------------------------------------------------
+
+    def _next_id(self, table: str) -> int:
+        """Return the next AUTOINCREMENT id for *table* (call under a write lock)."""
+        row = self.conn.execute(
+            f"""SELECT MAX(
+                   COALESCE((SELECT seq FROM sqlite_sequence WHERE name = ?), 0),
+                   COALESCE((SELECT MAX(id) FROM {table}), 0)
+               ) + 1""",
+            (table,),
+        ).fetchone()
+        return row[0]
+
+    def bulk_insert_articles(
+        self, rows: Sequence[dict[str, Any]]
+    ) -> list[tuple[int, int]]:
+        """Insert (news item, article, visual asset) triples in one transaction.
+
+        Each row holds ``"news"``, ``"article"`` and ``"asset"`` dicts with the
+        keyword arguments of :meth:`insert_news_item`, :meth:`insert_article`
+        and :meth:`insert_visual_asset` (minus the foreign keys). The dicts may
+        also carry ``collected_at`` / ``created_at`` timestamps; they default
+        to now. Ids are allocated up front under a write lock so each table is
+        written with a single ``executemany``.
+
+        Returns:
+            ``(article_id, visual_asset_id)`` for each row, in order.
+        """
+        if not rows:
+            return []
+        now = _now()
+        with self.transaction() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            news_id = self._next_id("news_items")
+            article_id = self._next_id("articles")
+            asset_id = self._next_id("visual_assets")
+
+            news_rows, article_rows, asset_rows, ids = [], [], [], []
+            for i, row in enumerate(rows):
+                news, article, asset = row["news"], row["article"], row["asset"]
+                news_rows.append((
+                    news_id + i,
+                    news["country"],
+                    news["title"],
+                    news.get("url", ""),
+                    news.get("source", ""),
+                    news.get("summary", ""),
+                    news.get("relevance_score", 0),
+                    news.get("collected_at", now),
+                    news.get("status", "new"),
+                ))
+                article_rows.append((
+                    article_id + i,
+                    news_id + i,
+                    article["country"],
+                    article["language"],
+                    article["platform"],
+                    article["title"],
+                    article.get("body", ""),
+                    article.get("caption", ""),
+                    article.get("hashtags", ""),
+                    int(article.get("has_fomus_mention", False)),
+                    article.get("created_at", now),
+                    article.get("status", "draft"),
+                ))
+                asset_rows.append((
+                    asset_id + i,
+                    article_id + i,
+                    asset["image_path"],
+                    asset.get("prompt_used", ""),
+                    asset.get("aspect_ratio", "1:1"),
+                    asset.get("created_at", now),
+                ))
+                ids.append((article_id + i, asset_id + i))
+
+            conn.executemany(
+                """INSERT INTO news_items
+                   (id, country, title, url, source, summary, relevance_score,
+                    collected_at, status)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                news_rows,
+            )
+            conn.executemany(
+                """INSERT INTO articles
+                   (id, news_item_id, country, language, platform, title, body,
+                    caption, hashtags, has_fomus_mention, created_at, status)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                article_rows,
+            )
+            conn.executemany(
+                """INSERT INTO visual_assets
+                   (id, article_id, image_path, prompt_used, aspect_ratio, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                asset_rows,
+            )
+        return ids
+
     # ------------------------------------------------------------------
     # distribution_queue CRUD
     # ------------------------------------------------------------------
@@ -307,7 +505,7 @@ class Database:
                VALUES (?, ?, ?, ?, ?)""",
             (article_id, visual_asset_id, platform, scheduled_time, tz),
         )
-        self.conn.commit()
+        self._commit()
         return cur.lastrowid  # type: ignore[return-value]
 
     def get_distribution_queue(
@@ -347,7 +545,66 @@ class Database:
                 "UPDATE distribution_queue SET status = ? WHERE id = ?",
                 (status, dist_id),
             )
-        self.conn.commit()
+        self._commit()
+
+    # ------------------------------------------------------------------
+    # posted_tweets CRUD
+    # ------------------------------------------------------------------
+
+    def get_posted_tweet_ids(self) -> set[int]:
+        """Return the ids of articles already posted to X."""
+        rows = self.conn.execute("SELECT article_id FROM posted_tweets").fetchall()
+        return {r["article_id"] for r in rows}
+
+    def mark_tweets_posted(
+        self,
+        article_ids: Iterable[int],
+        tweet_id: Optional[str] = None,
+    ) -> None:
+        """Record *article_ids* as posted; ids already recorded are kept as-is."""
+        now = _now()
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO posted_tweets (article_id, tweet_id, posted_at) VALUES (?, ?, ?)",
+            [(article_id, tweet_id, now) for article_id in article_ids],
+        )
+        self._commit()
+
+    # ------------------------------------------------------------------
+    # llm_cache CRUD
+    # ------------------------------------------------------------------
+
+    def get_llm_cache(self, key: str, since: Optional[str] = None) -> Optional[dict[str, Any]]:
+        """Return the cached LLM response for *key*, if any.
+
+        Args:
+            key: Cache key.
+            since: Optional ISO timestamp; older entries count as a miss.
+        """
+        if since is None:
+            row = self.conn.execute(
+                "SELECT * FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        else:
+            row = self.conn.execute(
+                "SELECT * FROM llm_cache WHERE key = ? AND created_at >= ?", (key, since)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def insert_llm_cache(
+        self,
+        key: str,
+        namespace: str,
+        title: str,
+        body: str,
+    ) -> None:
+        """Insert or replace a cached LLM response."""
+        self.conn.execute(
+            """INSERT OR REPLACE INTO llm_cache
+               (key, namespace, title, body, created_at)
+               VALUES (?, ?, ?, ?, ?)""",
+            (key, namespace, title, body, _now()),
+        )
+        self._commit()
 
     # ------------------------------------------------------------------
     # Status / statistics
@@ -381,3 +638,21 @@ class Database:
 
 def _now() -> str:
     return datetime.now(timezone.utc).isoformat()
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a news URL for duplicate detection.
+
+    Unwraps Google News ``url=`` redirects, drops ``utm_*`` tracking
+    parameters and the fragment.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if parts.netloc.endswith("news.google.com"):
+        target = dict(query).get("url")
+        if target:
+            return canonical_url(target)
+    query = [(k, v) for k, v in query if not k.lower().startswith("utm_")]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
@@ -0,0 +1,123 @@
+"""Shared GPT helpers for the generation scripts.
+
+Holds the process-wide async OpenAI client, the call-rate limiter and
+the plain-text completion helpers. Kept free of the RSS/HTTP stack so
+scripts that only talk to GPT (tweets, TikTok key points, travel
+articles) do not import feedparser, httpx or certifi.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+from typing import TYPE_CHECKING, Optional
+
+from src.rate_limit import TokenBucket
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+MODEL = "gpt-5.2"
+
+# Request concurrency and call rate (matches the OpenAI 500 RPM tier).
+GPT_CONCURRENCY = 4
+GPT_LIMITER = TokenBucket(rate=500 / 60, capacity=10)
+
+
+@functools.lru_cache(maxsize=1)
+def get_openai_client() -> "AsyncOpenAI":
+    """Return the shared async OpenAI client."""
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI()
+
+
+def _parse_title_body(text: str) -> tuple[str, str]:
+    """Split a plain-text article into its first-line title and the body.
+
+    Text without a newline is used as both title and body.
+    """
+    text = text.strip()
+    idx = text.find("\n")
+    if idx == -1:
+        return text.lstrip("#").strip(), text
+    return text[:idx].lstrip("#").strip(), text[idx + 1:].strip()
+
+
+async def _read_title_body(stream) -> tuple[str, str]:
+    """Read a streamed completion; the first line is the title, the rest the body.
+
+    The title is fixed as soon as the first newline arrives. A title
+    followed only by whitespace is parsed like the non-streaming path
+    (:func:`_parse_title_body`), which uses the title as the body.
+    """
+    title: Optional[str] = None
+    title_line = ""
+    head = ""
+    body_parts: list[str] = []
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content or ""
+        if title is not None:
+            body_parts.append(delta)
+            continue
+        head += delta
+        # Only the new delta can contain the first newline after the title.
+        idx = head.find("\n", len(head) - len(delta))
+        while idx != -1 and not head[:idx].strip():
+            idx = head.find("\n", idx + 1)
+        if idx != -1:
+            title_line = head[:idx]
+            title, _ = _parse_title_body(title_line)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("    → タイトル受信: %s", title[:40])
+            body_parts.append(head[idx + 1:])
+
+    if title is None:
+        return _parse_title_body(head)
+    body = "".join(body_parts).strip()
+    if not body:
+        return _parse_title_body(title_line)
+    return title, body
+
+
+async def complete(
+    prompt: str,
+    *,
+    model: str = MODEL,
+    max_completion_tokens: int = 4000,
+    temperature: float = 0.7,
+    system: Optional[str] = None,
+) -> str:
+    """Return the stripped text of a chat completion for *prompt* (rate limited).
+
+    A constant *system* message goes first so the API can reuse its
+    cached prefix across calls.
+    """
+    messages = [{"role": "user", "content": prompt}]
+    if system is not None:
+        messages.insert(0, {"role": "system", "content": system})
+    await GPT_LIMITER.acquire_async()
+    response = await get_openai_client().chat.completions.create(
+        model=model,
+        messages=messages,
+        max_completion_tokens=max_completion_tokens,
+        temperature=temperature,
+    )
+    return (response.choices[0].message.content or "").strip()
+
+
+async def generate_title_body(prompt: str, *, max_completion_tokens: int = 4000) -> tuple[str, str]:
+    """Stream a GPT-5.2 article for *prompt* and split it into title and body."""
+    await GPT_LIMITER.acquire_async()
+    stream = await get_openai_client().chat.completions.create(
+        model=MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        max_completion_tokens=max_completion_tokens,
+        temperature=0.7,
+        stream=True,
+    )
+    return await _read_title_body(stream)
@@ -0,0 +1,69 @@
+"""Keyword-based article genre classification.
+
+Kept free of heavy imports so scripts that only need the classifier do
+not pull in the image generation clients. The ``genres`` section of
+countries.yaml is the single source of genre keywords.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent.parent / "config" / "countries.yaml"
+
+
+class GenreClassifier:
+    """Keyword-based genre classifier with keywords case-folded once.
+
+    Every configured keyword found as a substring of the case-folded
+    title+body counts once, and the genre with the most hits wins (ties
+    keep the earlier genre).
+
+    Args:
+        keywords: Genre key -> keywords, in priority order.
+        default: Genre returned when no keyword matches.
+    """
+
+    def __init__(self, keywords: Mapping[str, Iterable[str]], default: str = "business") -> None:
+        self.default = default
+        self._genres: tuple[tuple[str, tuple[str, ...]], ...] = tuple(
+            (genre_key, tuple(kw.casefold() for kw in genre_keywords))
+            for genre_key, genre_keywords in keywords.items()
+        )
+
+    @classmethod
+    def from_genres_config(cls, genres_config: dict[str, Any]) -> "GenreClassifier":
+        """Build a classifier from the ``genres`` section of countries.yaml."""
+        return cls({
+            genre_key: genre_info.get("keywords", [])
+            for genre_key, genre_info in genres_config.items()
+        })
+
+    def classify(self, title: str, body: str) -> str:
+        text = f"{title} {body}".casefold()
+        best_genre = self.default
+        best_count = 0
+
+        for genre_key, keywords in self._genres:
+            count = sum(1 for kw in keywords if kw in text)
+            if count > best_count:
+                best_count = count
+                best_genre = genre_key
+
+        return best_genre
+
+
+@lru_cache(maxsize=1)
+def load_genres_config() -> dict[str, Any]:
+    """Return the ``genres`` section of countries.yaml, parsed once per process."""
+    from src.config import load_countries_config
+
+    return load_countries_config(CONFIG_PATH).get("genres", {})
+
+
+@lru_cache(maxsize=1)
+def default_classifier() -> GenreClassifier:
+    """Return the classifier built from countries.yaml, shared per process."""
+    return GenreClassifier.from_genres_config(load_genres_config())
@@ -19,6 +19,8 @@ from google import genai
 from google.genai import types
 from PIL import Image, ImageDraw
 
+from src.images.genre import GenreClassifier
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -165,23 +167,28 @@ def _generate_photo(title: str, country: str, genre: str) -> Optional[Image.Imag
 
 
 def _center_crop(img: Image.Image, target_w: int, target_h: int) -> Image.Image:
-    """Resize and center-crop an image to the exact target dimensions."""
+    """Resize and center-crop an image to the exact target dimensions.
+
+    Only the centred source region is resampled (``box``), and
+    ``reducing_gap`` lets Pillow shrink large photos with a fast integer
+    reduction before the LANCZOS pass.
+    """
     src_w, src_h = img.size
     target_ratio = target_w / target_h
-    src_ratio = src_w / src_h
 
-    if src_ratio > target_ratio:
-        new_h = target_h
-        new_w = int(src_w * (target_h / src_h))
+    if src_w / src_h > target_ratio:
+        box_w, box_h = src_h * target_ratio, src_h
     else:
-        new_w = target_w
-        new_h = int(src_h * (target_w / src_w))
-
-    img = img.resize((new_w, new_h), Image.LANCZOS)
-
-    left = (new_w - target_w) // 2
-    top = (new_h - target_h) // 2
-    return img.crop((left, top, left + target_w, top + target_h))
+        box_w, box_h = src_w, src_w / target_ratio
+
+    left = (src_w - box_w) / 2
+    top = (src_h - box_h) / 2
+    return img.resize(
+        (target_w, target_h),
+        Image.LANCZOS,
+        box=(left, top, left + box_w, top + box_h),
+        reducing_gap=3.0,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -261,17 +268,20 @@ def generate_thumbnail(
 # Convenience: classify genre from article data
 # ---------------------------------------------------------------------------
 
+# Classifier built for the most recently seen genres_config object
+_classifier_cache: tuple[Optional[dict[str, Any]], Optional[GenreClassifier]] = (None, None)
+
+
+def get_genre_classifier(genres_config: dict[str, Any]) -> GenreClassifier:
+    """Return a classifier for *genres_config*, reusing it across calls."""
+    global _classifier_cache
+    config, classifier = _classifier_cache
+    if config is not genres_config or classifier is None:
+        classifier = GenreClassifier.from_genres_config(genres_config)
+        _classifier_cache = (genres_config, classifier)
+    return classifier
+
+
 def classify_genre(title: str, body: str, genres_config: dict[str, Any]) -> str:
     """Classify an article into a genre based on keyword matching."""
-    text = (title + " " + body).lower()
-    best_genre = "business"
-    best_count = 0
-
-    for genre_key, genre_info in genres_config.items():
-        keywords = genre_info.get("keywords", [])
-        count = sum(1 for kw in keywords if kw.lower() in text)
-        if count > best_count:
-            best_count = count
-            best_genre = genre_key
-
-    return best_genre
+    return get_genre_classifier(genres_config).classify(title, body)
@@ -0,0 +1,3 @@
+from src.ingest.news_feed import fetch_news, rewrite_article, rewrite_cached
+
+__all__ = ["fetch_news", "rewrite_article", "rewrite_cached"]
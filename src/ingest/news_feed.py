@@ -0,0 +1,321 @@
+"""Shared news ingestion for the article generation scripts.
+
+Fetches Google News RSS feeds and rewrites news items into Japanese
+articles with GPT-5.2. The HTTP client here and the OpenAI client in
+:mod:`src.gpt` are process-wide singletons so every script (and every
+country/genre within a run) reuses the same connections. Scripts only
+supply their feeds and prompt configuration.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import itertools
+import logging
+import re
+import ssl
+import urllib.parse
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, Sequence, Union
+
+import certifi
+import feedparser
+import httpx
+
+from src.database.models import canonical_url
+from src.gpt import (
+    GPT_LIMITER,
+    MODEL,
+    _parse_title_body,
+    generate_title_body,
+    get_openai_client,
+)
+
+if TYPE_CHECKING:
+    from src.database.llm_cache import RewriteCache
+
+logger = logging.getLogger(__name__)
+
+# Google News RSS is known to be RSS 2.0; passing the content type skips sniffing.
+_RSS_HEADERS = {"content-type": "application/rss+xml"}
+_RSS_TIMEOUT = 10
+
+DEFAULT_RULES: tuple[str, ...] = (
+    "1行目に記事タイトル（日本語）を書き、2行目は空行、3行目から本文",
+    "約2000文字",
+    "JSONやマークダウンは不要。プレーンテキストのみ",
+)
+
+
+# ---------------------------------------------------------------------------
+# Clients
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=1)
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared keep-alive client used for all RSS fetches."""
+    ssl_ctx = ssl.create_default_context(cafile=certifi.where())
+    return httpx.AsyncClient(verify=ssl_ctx, timeout=_RSS_TIMEOUT, follow_redirects=True)
+
+
+# ---------------------------------------------------------------------------
+# RSS
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def _quote_url(url: str) -> str:
+    """Percent-encode an RSS URL that contains a Japanese query."""
+    return urllib.parse.quote(url, safe=":/?&=+%")
+
+
+async def _fetch_entries(url: str) -> list:
+    try:
+        resp = await get_http_client().get(_quote_url(url))
+        resp.raise_for_status()
+        return feedparser.parse(resp.content, response_headers=_RSS_HEADERS).entries
+    except Exception as e:
+        logger.warning("RSS取得エラー (%s): %s", url[:60], e)
+        return []
+
+
+async def fetch_news(
+    feeds: Iterable[str],
+    count: int = 10,
+    is_known: Optional[Callable[[str, str], bool]] = None,
+) -> list[dict]:
+    """Fetch news items from Google News RSS feeds.
+
+    Feeds are fetched concurrently; title de-duplication and the count cap
+    are applied in feed order. Items for which ``is_known(title, url)``
+    returns True (already stored in the DB) are skipped.
+
+    Returns:
+        List of ``{"title", "description", "link"}`` dicts.
+    """
+    results = await asyncio.gather(*[_fetch_entries(url) for url in feeds])
+
+    articles: list[dict] = []
+    seen: set[str] = set()
+    skipped = 0
+    debug = logger.isEnabledFor(logging.DEBUG)
+    for entry in itertools.chain.from_iterable(results):
+        title = entry.get("title", "").strip()
+        if not title or title in seen:
+            continue
+        seen.add(title)
+        link = canonical_url(entry.get("link", ""))
+        if is_known is not None and is_known(title, link):
+            skipped += 1
+            if debug:
+                logger.debug("  既出ニュースのためスキップ: %s", title[:60])
+            continue
+        articles.append({
+            "title": title,
+            "description": entry.get("summary", "")[:800],
+            "link": link,
+        })
+        if len(articles) >= count:
+            break
+
+    if skipped:
+        logger.info("  既出ニュース %d 件をスキップ", skipped)
+    return articles
+
+
+# ---------------------------------------------------------------------------
+# GPT rewrite
+# ---------------------------------------------------------------------------
+
+def build_prompt(
+    title: str,
+    description: str,
+    *,
+    tone: str,
+    rules: Sequence[str] = DEFAULT_RULES,
+    rules_heading: str = "ルール",
+    sections: Sequence[tuple[str, str]] = (),
+) -> str:
+    """Build the rewrite prompt from a script's tone, extra sections and rules."""
+    parts = [
+        f"{tone}\n\n",
+        "以下のニュースを元に、日本語で約2000文字の記事を書いてください。\n\n",
+        f"【元ニュース】\nタイトル: {title}\n概要: {description}\n\n",
+    ]
+    parts.extend(f"【{heading}】\n{text}\n\n" for heading, text in sections)
+    parts.append(f"【{rules_heading}】\n")
+    parts.extend(f"- {rule}\n" for rule in rules)
+    return "".join(parts)
+
+
+async def rewrite_article(
+    title: str,
+    description: str,
+    *,
+    tone: str,
+    hashtags: str = "",
+    rules: Sequence[str] = DEFAULT_RULES,
+    rules_heading: str = "ルール",
+    sections: Sequence[tuple[str, str]] = (),
+) -> dict:
+    """Rewrite a news item into a ~2000 character Japanese article with GPT-5.2.
+
+    Returns:
+        ``{"title", "body", "hashtags"}``.
+    """
+    prompt = build_prompt(
+        title, description,
+        tone=tone, rules=rules, rules_heading=rules_heading, sections=sections,
+    )
+    article_title, body = await generate_title_body(prompt)
+    return {"title": article_title, "body": body, "hashtags": hashtags}
+
+
+async def rewrite_cached(
+    sem: asyncio.Semaphore,
+    cache: "RewriteCache",
+    namespace: str,
+    news: dict,
+    **prompt_config,
+) -> dict:
+    """Call :func:`rewrite_article` through the rewrite cache, bounded by ``sem``.
+
+    ``prompt_config`` is passed through to :func:`rewrite_article`.
+    """
+    async with sem:
+        article = await cache.get_or_create(
+            namespace,
+            news["title"],
+            news["description"],
+            lambda: rewrite_article(news["title"], news["description"], **prompt_config),
+        )
+    return {**article, "hashtags": prompt_config.get("hashtags", "")}
+
+
+# ---------------------------------------------------------------------------
+# Batched GPT rewrite
+# ---------------------------------------------------------------------------
+
+# Delimiter line the model writes before each article in a batched response.
+_ARTICLE_DELIM_RE = re.compile(
+    r"^\s*-{3,}\s*ARTICLE\s*(\d+)\s*-{3,}\s*$", re.MULTILINE | re.IGNORECASE,
+)
+
+_BATCH_RULE = "各記事の直前に「---ARTICLE 番号---」だけの行を置き、元ニュースと同じ番号・順番で書く"
+
+
+def _split_articles(text: str, count: int) -> list[Optional[str]]:
+    """Split a batched response on its ``---ARTICLE n---`` lines.
+
+    Returns one entry per requested article; None where the model left
+    the article out.
+    """
+    parts = _ARTICLE_DELIM_RE.split(text)
+    articles: list[Optional[str]] = [None] * count
+    # parts = [preamble, n1, text1, n2, text2, ...]
+    for number, chunk in zip(parts[1::2], parts[2::2]):
+        index = int(number) - 1
+        if 0 <= index < count and articles[index] is None and chunk.strip():
+            articles[index] = chunk
+    return articles
+
+
+def build_batch_prompt(
+    news_items: Sequence[dict],
+    *,
+    tone: str,
+    rules: Sequence[str] = DEFAULT_RULES,
+    rules_heading: str = "ルール",
+    sections: Sequence[tuple[str, str]] = (),
+) -> str:
+    """Build one prompt asking for an article per news item.
+
+    The tone, sections and rules appear once however many items there are.
+    """
+    parts = [
+        f"{tone}\n\n",
+        f"以下の{len(news_items)}本のニュースを元に、それぞれ日本語で約2000文字の記事を書いてください。\n\n",
+    ]
+    parts.extend(
+        f"【元ニュース{i}】\nタイトル: {news['title']}\n概要: {news['description']}\n\n"
+        for i, news in enumerate(news_items, start=1)
+    )
+    parts.extend(f"【{heading}】\n{text}\n\n" for heading, text in sections)
+    parts.append(f"【{rules_heading}】\n")
+    parts.extend(f"- {rule}\n" for rule in (_BATCH_RULE, *rules))
+    return "".join(parts)
+
+
+async def rewrite_articles_batch(
+    news_items: Sequence[dict],
+    *,
+    tone: str,
+    hashtags: str = "",
+    rules: Sequence[str] = DEFAULT_RULES,
+    rules_heading: str = "ルール",
+    sections: Sequence[tuple[str, str]] = (),
+) -> list[Union[dict, Exception]]:
+    """Rewrite several news items with a single GPT-5.2 call.
+
+    Returns one ``{"title", "body", "hashtags"}`` dict per item, in order,
+    or a ``ValueError`` for items missing from the response. API errors
+    propagate.
+    """
+    if not news_items:
+        return []
+    prompt = build_batch_prompt(
+        news_items, tone=tone, rules=rules, rules_heading=rules_heading, sections=sections,
+    )
+
+    await GPT_LIMITER.acquire_async()
+    stream = await get_openai_client().chat.completions.create(
+        model=MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        max_completion_tokens=4000 * len(news_items),
+        temperature=0.7,
+        stream=True,
+    )
+    parts: list[str] = []
+    async for chunk in stream:
+        if chunk.choices:
+            parts.append(chunk.choices[0].delta.content or "")
+
+    results: list[Union[dict, Exception]] = []
+    for i, text in enumerate(_split_articles("".join(parts), len(news_items)), start=1):
+        if text is None:
+            results.append(ValueError(f"バッチ応答に記事{i}がありません"))
+            continue
+        title, body = _parse_title_body(text)
+        results.append({"title": title, "body": body, "hashtags": hashtags})
+    return results
+
+
+async def rewrite_cached_batch(
+    cache: "RewriteCache",
+    namespace: str,
+    news_items: Sequence[dict],
+    **prompt_config,
+) -> list[Union[dict, BaseException]]:
+    """Rewrite *news_items* through the rewrite cache with one GPT call for the misses.
+
+    ``prompt_config`` is passed through to :func:`rewrite_articles_batch`.
+    """
+    results = await cache.get_or_create_many(
+        namespace,
+        [(news["title"], news["description"]) for news in news_items],
+        lambda misses: rewrite_articles_batch(
+            [{"title": title, "description": description} for title, description in misses],
+            **prompt_config,
+        ),
+    )
+    hashtags = prompt_config.get("hashtags", "")
+    return [
+        result if isinstance(result, BaseException) else {**result, "hashtags": hashtags}
+        for result in results
+    ]
+
+
+async def aclose() -> None:
+    """Close the shared HTTP client; call once at the end of a script run."""
+    if get_http_client.cache_info().currsize:
+        await get_http_client().aclose()
+        get_http_client.cache_clear()
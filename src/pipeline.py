@@ -81,7 +81,7 @@ class Pipeline:
 
         try:
             from src.agents.copywriter import Copywriter
-            writer = Copywriter()
+            writer = Copywriter(db=self.db)
         except ImportError:
             logger.warning(
                 "Copywriter agent not available yet. "
@@ -0,0 +1,58 @@
+"""Token-bucket rate limiter shared by the generation scripts.
+
+Unlike a fixed ``time.sleep`` after every call, the bucket only blocks
+when calls actually arrive faster than the configured rate, so slow API
+responses do not pay an extra delay.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Args:
+        rate: Tokens added per second (e.g. ``500 / 60`` for 500 RPM).
+        capacity: Maximum burst size.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _try_take(self) -> float:
+        """Take a token if available; otherwise return seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Block the calling thread until a token is available."""
+        while (wait := self._try_take()) > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait (without blocking the event loop) until a token is available."""
+        while (wait := self._try_take()) > 0:
+            await asyncio.sleep(wait)
+
+    def slow_down(self, factor: float = 0.5, min_rate: float = 0.0) -> float:
+        """Scale the refill rate down after the remote side signals throttling.
+
+        Returns the new rate, which never drops below ``min_rate``.
+        """
+        with self._lock:
+            self.rate = max(min_rate, self.rate * factor)
+            return self.rate
@@ -15,7 +15,8 @@ import shutil
 import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
+from xml.etree import ElementTree
 from xml.sax.saxutils import escape as xml_escape
 
 import yaml
@@ -160,6 +161,7 @@ class SiteGenerator:
         self.env = Environment(
             loader=FileSystemLoader(str(TEMPLATE_DIR)),
             autoescape=True,
+            cache_size=-1,
         )
         # Load configuration from YAML
         config = _load_config()
@@ -431,11 +433,20 @@ class SiteGenerator:
         )
         logger.info("Generated index page: %s (%d articles)", rel_path, len(articles))
 
-    def _generate_country_pages(self, lang: str = "ja") -> None:
-        """Generate country listing, region, and genre pages for each country."""
+    def _generate_country_pages(
+        self,
+        lang: str = "ja",
+        only: Optional[set[str]] = None,
+    ) -> None:
+        """Generate country listing, region, and genre pages for each country.
+
+        If *only* is given, pages are generated just for those countries.
+        """
         template = self.env.get_template("country.html")
 
         for country_key, country_info in COUNTRIES.items():
+            if only is not None and country_key not in only:
+                continue
             articles = self._get_articles(country=country_key, language=lang, limit=50)
             regions = self.regions_config.get(country_key, {})
 
@@ -656,12 +667,24 @@ class SiteGenerator:
                 len(genre_articles),
             )
 
-    def _generate_article_pages(self, lang: str = "ja") -> None:
-        """Generate individual article pages."""
+    def _generate_article_pages(
+        self,
+        lang: str = "ja",
+        article_ids: Optional[set[int]] = None,
+    ) -> None:
+        """Generate individual article pages.
+
+        If *article_ids* is given, only those pages are rendered (related
+        articles are still picked from the full article list).
+        """
         template = self.env.get_template("article.html")
         articles = self._get_articles(language=lang, limit=500)
+        targets = (
+            articles if article_ids is None
+            else [a for a in articles if a["id"] in article_ids]
+        )
 
-        for article in articles:
+        for article in targets:
             country_key = article["country"]
             country_info = COUNTRIES.get(country_key, {})
             slug = f"article-{article['id']}"
@@ -731,27 +754,32 @@ class SiteGenerator:
             )
 
         logger.info(
-            "Generated %d article pages for lang=%s", len(articles), lang,
+            "Generated %d article pages for lang=%s", len(targets), lang,
         )
 
-    def _copy_images(self) -> None:
+    def _copy_images(self, article_ids: Optional[set[int]] = None) -> None:
         """Copy visual assets to site/images/ directory.
 
         Preserves the source file extension (e.g. .jpg, .png) so that
-        template references match the actual file on disk.
+        template references match the actual file on disk. If
+        *article_ids* is given, only those articles' images are copied.
         """
         images_dir = SITE_DIR / "images"
         images_dir.mkdir(parents=True, exist_ok=True)
 
+        query = """
+            SELECT va.image_path, va.article_id, a.country
+            FROM visual_assets va
+            JOIN articles a ON a.id = va.article_id
+        """
+        params: list[Any] = []
+        if article_ids is not None:
+            query += f" WHERE va.article_id IN ({','.join('?' * len(article_ids))})"
+            params = list(article_ids)
+
         conn = self._get_conn()
         try:
-            rows = conn.execute(
-                """
-                SELECT va.image_path, va.article_id, a.country
-                FROM visual_assets va
-                JOIN articles a ON a.id = va.article_id
-                """
-            ).fetchall()
+            rows = conn.execute(query, params).fetchall()
         finally:
             conn.close()
 
@@ -969,8 +997,35 @@ class SiteGenerator:
     # Sitemap & robots.txt
     # ------------------------------------------------------------------
 
+    def _load_sitemap_pages(self) -> list[dict[str, str]]:
+        """Read page entries back from an existing sitemap.xml.
+
+        Used by incremental regeneration so pages that are not re-rendered
+        keep their sitemap entries.
+        """
+        sitemap_path = SITE_DIR / "sitemap.xml"
+        ns = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+        prefix = f"{SITE_URL}/"
+        pages: list[dict[str, str]] = []
+        root = ElementTree.parse(sitemap_path).getroot()
+        for url in root.findall("sm:url", ns):
+            loc = url.findtext("sm:loc", "", ns)
+            if not loc.startswith(prefix):
+                continue
+            pages.append({
+                "rel_path": loc[len(prefix):],
+                "priority": url.findtext("sm:priority", "0.5", ns),
+                "changefreq": url.findtext("sm:changefreq", "weekly", ns),
+            })
+        return pages
+
     def _generate_sitemap(self) -> None:
         """Generate sitemap.xml from all pages tracked during generation."""
+        # Later entries for the same page win (incremental regeneration
+        # appends re-rendered pages after the entries loaded from disk).
+        self._generated_pages = list(
+            {p["rel_path"]: p for p in self._generated_pages}.values()
+        )
         today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
         lines: list[str] = [
             '<?xml version="1.0" encoding="UTF-8"?>',
@@ -1082,6 +1137,53 @@ class SiteGenerator:
         logger.info("Generated %d HTML pages.", len(html_files))
         logger.info("=== Static Site Generation COMPLETE ===")
 
+    def regenerate(self, article_ids: Iterable[int]) -> None:
+        """Incrementally update the site after new articles were added.
+
+        Re-renders only the given article pages, the top-level index pages
+        and the listing pages of the countries those articles belong to;
+        existing sitemap entries are kept. Related-article links on older
+        article pages are refreshed by the next :meth:`generate_all`.
+        Falls back to a full build when the site has not been generated yet
+        or its sitemap.xml cannot be read.
+        """
+        ids = set(article_ids)
+        if not ids:
+            logger.info("No new articles; skipping site regeneration.")
+            return
+        if not (SITE_DIR / "sitemap.xml").exists():
+            self.generate_all()
+            return
+
+        try:
+            pages = self._load_sitemap_pages()
+        except (ElementTree.ParseError, OSError) as e:
+            logger.warning("Unreadable sitemap.xml (%s); running a full build instead.", e)
+            self.generate_all()
+            return
+
+        logger.info("=== Incremental Site Generation START (%d articles) ===", len(ids))
+        self._generated_pages = pages
+
+        conn = self._get_conn()
+        try:
+            rows = conn.execute(
+                f"SELECT DISTINCT country FROM articles WHERE id IN ({','.join('?' * len(ids))})",
+                list(ids),
+            ).fetchall()
+        finally:
+            conn.close()
+        countries = {r["country"] for r in rows}
+
+        for lang in ["ja", "en", "ar"]:
+            self._generate_index(lang)
+            self._generate_country_pages(lang, only=countries)
+            self._generate_article_pages(lang, article_ids=ids)
+
+        self._copy_images(article_ids=ids)
+        self._generate_sitemap()
+        logger.info("=== Incremental Site Generation COMPLETE ===")
+
 
 # ---------------------------------------------------------------------------
 # Standalone execution
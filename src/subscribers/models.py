@@ -9,7 +9,7 @@ import os
 import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
 
 logger = logging.getLogger(__name__)
 
@@ -155,6 +155,18 @@ class SubscriberDatabase:
         ).fetchall()
         return [dict(r) for r in rows]
 
+    def get_active_subscribers_after(self, last_id: int, limit: int = 50) -> list[dict[str, Any]]:
+        """id が ``last_id`` より大きいアクティブな購読者を id 順に取得する。
+
+        OFFSET と違い読み飛ばした行を毎回走査しないので、全件を順に
+        ページングする場合はこちらを使う。
+        """
+        rows = self.conn.execute(
+            "SELECT * FROM subscribers WHERE status = 'active' AND id > ? ORDER BY id ASC LIMIT ?",
+            (last_id, limit),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
     def count_active_subscribers(self) -> int:
         """アクティブな購読者数を返す。"""
         row = self.conn.execute(
@@ -197,6 +209,32 @@ class SubscriberDatabase:
         self.conn.commit()
         return cur.lastrowid  # type: ignore[return-value]
 
+    def bulk_log_newsletter_sent(self, entries: Sequence[dict[str, Any]]) -> None:
+        """ニュースレター送信ログをまとめて記録する (1 回の commit)。
+
+        各要素は ``log_newsletter_sent`` のキーワード引数を持つ dict。
+        ``sent_at`` を省略した場合は現在時刻を使う。
+        """
+        if not entries:
+            return
+        now = _now()
+        self.conn.executemany(
+            """INSERT INTO newsletter_log
+               (subscriber_id, sent_at, subject, article_count, status)
+               VALUES (?, ?, ?, ?, ?)""",
+            [
+                (
+                    e["subscriber_id"],
+                    e.get("sent_at", now),
+                    e["subject"],
+                    e["article_count"],
+                    e.get("status", "sent"),
+                )
+                for e in entries
+            ],
+        )
+        self.conn.commit()
+
     def was_newsletter_sent_today(self, subscriber_id: int) -> bool:
         """本日すでにニュースレターを送信済みか確認する。"""
         today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
@@ -207,6 +245,16 @@ class SubscriberDatabase:
         ).fetchone()
         return (row["cnt"] if row else 0) > 0
 
+    def get_subscribers_sent_today(self) -> set[int]:
+        """本日すでにニュースレターを送信済みの購読者 id をまとめて返す。"""
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        rows = self.conn.execute(
+            """SELECT DISTINCT subscriber_id FROM newsletter_log
+               WHERE sent_at LIKE ? AND status = 'sent'""",
+            (f"{today}%",),
+        ).fetchall()
+        return {row["subscriber_id"] for row in rows}
+
     # ------------------------------------------------------------------
     # Statistics
     # ------------------------------------------------------------------
@@ -11,14 +11,23 @@ moviepy TextClip のフォント問題を回避する。
   Scene 6 (3s) : CTA + ハッシュタグ
   合計: 3 + 5 + 7*3 + 3 = 32 秒
 
+Scene 1 は国とジャンルだけで決まるため、エンコード済みの mp4 を
+data/cache/video/ にキャッシュし、記事ごとに描画するのは Scene 2-6 のみ。
+両者は ffmpeg の concat demuxer (-c copy) で再エンコードせずに結合する。
+
 依存: moviepy, Pillow, numpy
 外部依存: ffmpeg (moviepy のバックエンド)
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
 import re
+import subprocess
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
@@ -191,8 +200,9 @@ def _hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
     )
 
 
-def _create_gradient_bg() -> Image.Image:
-    """縦型グラデーション背景を生成する。"""
+@lru_cache(maxsize=1)
+def _gradient_bg() -> Image.Image:
+    """縦型グラデーション背景 (全フレーム共通なので一度だけ描画する)。"""
     img = Image.new("RGB", (VIDEO_WIDTH, VIDEO_HEIGHT))
     draw = ImageDraw.Draw(img)
 
@@ -206,6 +216,11 @@ def _create_gradient_bg() -> Image.Image:
     return img
 
 
+def _create_gradient_bg() -> Image.Image:
+    """描画用にグラデーション背景のコピーを返す。"""
+    return _gradient_bg().copy()
+
+
 def _draw_text_shadow(
     draw: ImageDraw.ImageDraw,
     position: tuple[int, int],
@@ -303,6 +318,11 @@ def _draw_genre_badge(
 # シーンフレーム生成
 # ---------------------------------------------------------------------------
 
+# イントロ (Scene 1) の描画内容のバージョン。_make_logo_frame やそこから呼ぶ
+# 背景・国旗・バッジの描画を変えたら上げること (キャッシュ済みイントロを作り直す)
+INTRO_FRAME_VERSION = 1
+
+
 def _make_logo_frame(
     country: str,
     genre: str,
@@ -515,6 +535,52 @@ def _apply_fade_in(
     return clip.with_effects([vfx.FadeIn(duration)])
 
 
+# ---------------------------------------------------------------------------
+# 書き出し・結合
+# ---------------------------------------------------------------------------
+
+def _write_clip(clip: Any, path: Path) -> None:
+    """クリップを共通のエンコード設定で書き出す。
+
+    concat demuxer の -c copy 結合はストリームのパラメータが揃っている
+    必要があるため、イントロも本編も必ずこの関数で書き出す。
+    """
+    clip.write_videofile(
+        str(path),
+        fps=FPS,
+        codec=VIDEO_CODEC,
+        bitrate=VIDEO_BITRATE,
+        audio=False,
+        logger=None,  # moviepy のプログレスバーを抑制
+    )
+
+
+def _concat_copy(parts: list[Path], output_path: Path) -> None:
+    """ffmpeg の concat demuxer で再エンコードせずに結合する。"""
+    from moviepy.config import FFMPEG_BINARY
+
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".txt", delete=False, encoding="utf-8",
+    ) as f:
+        for part in parts:
+            escaped = str(part.resolve()).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+        list_path = Path(f.name)
+
+    try:
+        subprocess.run(
+            [
+                FFMPEG_BINARY, "-y", "-loglevel", "error",
+                "-f", "concat", "-safe", "0", "-i", str(list_path),
+                "-c", "copy", str(output_path),
+            ],
+            check=True,
+            capture_output=True,
+        )
+    finally:
+        list_path.unlink(missing_ok=True)
+
+
 # ---------------------------------------------------------------------------
 # メインジェネレータクラス
 # ---------------------------------------------------------------------------
@@ -540,6 +606,42 @@ class TikTokVideoGenerator:
         self._root = Path(__file__).resolve().parent.parent.parent
         self.output_dir = output_dir or (self._root / "data" / "videos")
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_dir = self._root / "data" / "cache" / "video"
+
+    def intro_path(self, country: str, genre: str = "") -> Path:
+        """Scene 1 (ロゴ + 国旗 + ジャンルバッジ) のエンコード済み mp4 を返す。
+
+        (国, ジャンル) ごとに一度だけ描画・エンコードし、以降はキャッシュを返す。
+        キャッシュ名には描画バージョン (INTRO_FRAME_VERSION)・使用フォント・
+        エンコード設定を含めたハッシュを使うので、これらが変われば
+        自動的に作り直される。
+        """
+        accent_rgb = _hex_to_rgb(COUNTRY_ACCENT.get(country, "#D4AF37"))
+        key = "|".join(map(str, (
+            INTRO_FRAME_VERSION, country, genre, accent_rgb,
+            _find_font(_JP_FONT_CANDIDATES), _find_font(_EN_FONT_CANDIDATES),
+            SCENE_LOGO_DURATION, VIDEO_WIDTH, VIDEO_HEIGHT, FPS, VIDEO_CODEC, VIDEO_BITRATE,
+        )))
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+        path = self.cache_dir / f"{country}_{digest}_intro.mp4"
+        if path.exists():
+            return path
+
+        from moviepy import ImageClip
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        clip = ImageClip(
+            _make_logo_frame(country, genre, accent_rgb),
+            duration=SCENE_LOGO_DURATION,
+        )
+        clip = _apply_fade_in(clip, 0.6)
+
+        # 書き出し途中のファイルをキャッシュとして拾わないよう一時名で書いてから置き換える
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.mp4")
+        _write_clip(clip, tmp_path)
+        os.replace(tmp_path, path)
+        logger.info("イントロをキャッシュ: %s", path.name)
+        return path
 
     def generate(
         self,
@@ -577,8 +679,10 @@ class TikTokVideoGenerator:
 
         logger.info("動画生成開始: %s (%s)", title[:40], country)
 
-        # ── 各シーンのフレームを生成 ──
-        logo_frame = _make_logo_frame(country, genre, accent_rgb)
+        # ── Scene 1 はキャッシュ済みのイントロを使う ──
+        intro_path = self.intro_path(country, genre)
+
+        # ── Scene 2-6 のフレームを生成 ──
         title_frame = _make_title_frame(title, country, accent_rgb)
         point_frames = [
             _make_point_frame(i + 1, kp, country, accent_rgb)
@@ -590,11 +694,6 @@ class TikTokVideoGenerator:
         # ── moviepy クリップを構築 ──
         clips = []
 
-        # Scene 1: ロゴ
-        clip_logo = ImageClip(logo_frame, duration=SCENE_LOGO_DURATION)
-        clip_logo = _apply_fade_in(clip_logo, 0.6)
-        clips.append(clip_logo)
-
         # Scene 2: タイトル
         clip_title = ImageClip(title_frame, duration=SCENE_TITLE_DURATION)
         clip_title = _apply_fade_in(clip_title, 0.8)
@@ -613,6 +712,7 @@ class TikTokVideoGenerator:
 
         # ── 結合 ──
         final = concatenate_videoclips(clips, method="compose")
+        duration = SCENE_LOGO_DURATION + final.duration
 
         # ── 出力パス決定 ──
         if output_path is None:
@@ -625,23 +725,33 @@ class TikTokVideoGenerator:
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # ── 動画書き出し ──
+        # ── 動画書き出し: 本編だけエンコードし、イントロとはストリームコピーで結合 ──
         logger.info("動画書き出し中: %s", output_path)
-        final.write_videofile(
-            str(output_path),
-            fps=FPS,
-            codec=VIDEO_CODEC,
-            bitrate=VIDEO_BITRATE,
-            audio=False,
-            logger=None,  # moviepy のプログレスバーを抑制
-        )
+        body_path = output_path.with_name(f"{output_path.stem}.body.mp4")
+        try:
+            _write_clip(final, body_path)
+            try:
+                _concat_copy([intro_path, body_path], output_path)
+            except (OSError, subprocess.CalledProcessError) as e:
+                logger.warning("concat 結合に失敗したため全体を再エンコードします: %s", e)
+                clip_logo = ImageClip(
+                    _make_logo_frame(country, genre, accent_rgb),
+                    duration=SCENE_LOGO_DURATION,
+                )
+                clip_logo = _apply_fade_in(clip_logo, 0.6)
+                _write_clip(
+                    concatenate_videoclips([clip_logo, *clips], method="compose"),
+                    output_path,
+                )
+        finally:
+            body_path.unlink(missing_ok=True)
 
         file_size_mb = output_path.stat().st_size / (1024 * 1024)
         logger.info(
             "動画生成完了: %s (%.1f MB, %.0f 秒)",
             output_path.name,
             file_size_mb,
-            final.duration,
+            duration,
         )
 
         # TikTok 上限チェック
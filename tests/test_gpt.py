@@ -0,0 +1,30 @@
+"""Regression tests for the streamed title/body parser in src.gpt."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.gpt import _parse_title_body, _read_title_body
+
+
+async def _stream(chunks):
+    for content in chunks:
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+
+@pytest.mark.parametrize("chunks", [
+    ["Title\n\n"],
+    ["Title", "\n", "\n  \n"],
+    ["# Title\n", "   "],
+    ["\n\nTitle\nBody text\n"],
+    ["Tit", "le\nBo", "dy"],
+    ["No newline at all"],
+])
+def test_streamed_parse_matches_non_streaming(chunks):
+    text = "".join(chunks)
+    assert asyncio.run(_read_title_body(_stream(chunks))) == _parse_title_body(text)
+
+
+def test_title_without_body_keeps_title_as_body():
+    assert asyncio.run(_read_title_body(_stream(["Title\n\n"]))) == ("Title", "Title")